@@ -0,0 +1,418 @@
+"""
+Performance benchmarks for the resume screening pipeline.
+
+Run one benchmark at a time from the repository root, e.g.
+
+    python benchmarks.py ocr --corpus path/to/scanned_resumes
+    python benchmarks.py skills --corpus path/to/resumes
+    python benchmarks.py regex --corpus path/to/resumes
+    python benchmarks.py encode --corpus path/to/resumes
+    python benchmarks.py embed-backends --corpus path/to/resumes
+
+Corpora are not shipped with the repo; point --corpus at a fixed folder of resumes so
+numbers stay comparable between runs.
+"""
+import argparse
+import os
+import time
+
+from PIL import Image
+
+
+def _load_corpus_pages(corpus_dir, dpi):
+    """Rasterizes every PDF/image in the corpus once, so rendering is not part of the timings."""
+    from pdf2image import convert_from_path
+
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        ext = os.path.splitext(name.lower())[1]
+        if ext == ".pdf":
+            pages.extend(convert_from_path(path, dpi=dpi, grayscale=True))
+        elif ext in (".png", ".jpg", ".jpeg"):
+            pages.append(Image.open(path).convert("L"))
+    return pages
+
+
+def benchmark_ocr_backends(corpus_dir, dpi=200, config="--oem 1 --psm 3"):
+    """Compares pages per second of the pytesseract and tesserocr OCR backends."""
+    from ocr_engine import create_ocr_backend, tesserocr
+
+    pages = _load_corpus_pages(corpus_dir, dpi)
+    if not pages:
+        print(f"No PDF or image files found in {corpus_dir}.")
+        return []
+    print(f"Loaded {len(pages)} pages from {corpus_dir} at {dpi} DPI.")
+
+    results = []
+    for backend_name in ("pytesseract", "tesserocr"):
+        if backend_name == "tesserocr" and tesserocr is None:
+            print("Skipping tesserocr: not installed.")
+            continue
+
+        load_start = time.perf_counter()
+        backend = create_ocr_backend(backend_name, config=config)
+        load_seconds = time.perf_counter() - load_start
+        if backend.name != backend_name:
+            print(f"Skipping {backend_name}: could not be initialised.")
+            continue
+
+        total_chars = 0
+        start = time.perf_counter()
+        for page in pages:
+            total_chars += len(backend.image_to_string(page))
+        elapsed = time.perf_counter() - start
+        backend.close()
+
+        results.append({
+            "backend": backend_name,
+            "pages": len(pages),
+            "load_s": round(load_seconds, 3),
+            "total_s": round(elapsed, 3),
+            "pages_per_s": round(len(pages) / elapsed, 2) if elapsed else float("inf"),
+            "chars": total_chars,
+        })
+
+    for row in results:
+        print(f"{row['backend']:<12} load {row['load_s']:>7.3f}s  {row['pages']} pages in {row['total_s']:>8.3f}s  "
+              f"-> {row['pages_per_s']:>7.2f} pages/s  ({row['chars']} chars)")
+    return results
+
+
+def _load_corpus_texts(corpus_dir):
+    """Extracts the text of every resume in the corpus once, through the screener's own extractor."""
+    import mimetypes
+    from screener import extract_text_from_file
+
+    texts = []
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            text = extract_text_from_file(f.read(), name, mimetypes.guess_type(name)[0] or "")
+        if not text.startswith("[ERROR]"):
+            texts.append((name, text))
+    return texts
+
+
+def _legacy_extract_relevant_keywords(text, filter_set):
+    """The per-skill regex loop extract_relevant_keywords used before the compiled matcher."""
+    import collections
+    import re
+    from screener import SKILL_CATEGORIES, clean_text
+
+    cleaned_text = clean_text(text)
+    extracted_keywords = set()
+    categorized_keywords = collections.defaultdict(list)
+    temp_text = cleaned_text
+    for skill_phrase in sorted(list(filter_set), key=len, reverse=True):
+        pattern = r'\b' + re.escape(skill_phrase.lower()) + r'\b'
+        if re.findall(pattern, temp_text):
+            extracted_keywords.add(skill_phrase.lower())
+            for category, skills_in_category in SKILL_CATEGORIES.items():
+                if skill_phrase.lower() in [s.lower() for s in skills_in_category]:
+                    categorized_keywords[category].append(skill_phrase)
+                    break
+            else:
+                categorized_keywords["Uncategorized"].append(skill_phrase)
+            temp_text = re.sub(pattern, " ", temp_text)
+    for word in set(re.findall(r'\b\w+\b', temp_text)):
+        if word in filter_set:
+            extracted_keywords.add(word)
+    return extracted_keywords, dict(categorized_keywords)
+
+
+def _time_per_call(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def benchmark_skill_matcher(corpus_dir, repeat=5):
+    """Per-resume latency of extract_relevant_keywords against the old per-skill regex loop."""
+    from screener import MASTER_SKILLS, extract_relevant_keywords
+
+    texts = _load_corpus_texts(corpus_dir)
+    if not texts:
+        print(f"No readable resumes found in {corpus_dir}.")
+        return {}
+    print(f"Loaded {len(texts)} resumes from {corpus_dir}; {len(MASTER_SKILLS)} skills in the vocabulary.")
+
+    mismatches = [name for name, text in texts
+                  if extract_relevant_keywords(text, MASTER_SKILLS)[0] != _legacy_extract_relevant_keywords(text, MASTER_SKILLS)[0]]
+    legacy_s = _time_per_call(lambda text: _legacy_extract_relevant_keywords(text, MASTER_SKILLS), texts, repeat)
+    compiled_s = _time_per_call(lambda text: extract_relevant_keywords(text, MASTER_SKILLS), texts, repeat)
+
+    result = {
+        "resumes": len(texts),
+        "legacy_ms": round(legacy_s * 1000, 3),
+        "compiled_ms": round(compiled_s * 1000, 3),
+        "speedup": round(legacy_s / compiled_s, 1) if compiled_s else float("inf"),
+        "mismatches": mismatches,
+    }
+    print(f"legacy loop   {result['legacy_ms']:>8.3f} ms/resume")
+    print(f"compiled      {result['compiled_ms']:>8.3f} ms/resume  ({result['speedup']}x)")
+    print(f"Skill sets differing from the legacy loop: {len(mismatches)}" + (f" {mismatches}" if mismatches else ""))
+    return result
+
+
+class _TimedPattern:
+    """Stands in for a compiled pattern and adds the time spent in each call to `stats`."""
+
+    def __init__(self, pattern, stats):
+        self.pattern = pattern
+        self.stats = stats
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        result = getattr(self.pattern, method)(*args, **kwargs)
+        if method == "finditer":
+            result = iter(list(result)) # Matching happens while iterating, so time it here
+        self.stats["seconds"] += time.perf_counter() - start
+        self.stats["calls"] += 1
+        return result
+
+    def search(self, *args, **kwargs):
+        return self._timed("search", *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._timed("match", *args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self._timed("findall", *args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        return self._timed("finditer", *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._timed("split", *args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self._timed("sub", *args, **kwargs)
+
+
+def benchmark_extractor_patterns(corpus_dir, repeat=5):
+    """
+    Time spent in each registered extractor regex while the screener's field extractors run
+    over the corpus, so the patterns that dominate resume analysis stand out.
+    """
+    import collections
+    import date_ranges
+    import resume_sections
+    import screener
+    from extractor_patterns import PATTERNS
+    from resume_document import ResumeDocument
+
+    texts = _load_corpus_texts(corpus_dir)
+    if not texts:
+        print(f"No readable resumes found in {corpus_dir}.")
+        return []
+    print(f"Loaded {len(texts)} resumes from {corpus_dir}; timing {len(PATTERNS)} patterns.")
+
+    extractors = [
+        screener.extract_years_of_experience, screener.extract_email, screener.extract_phone_number,
+        screener.extract_name, screener.extract_cgpa, screener.extract_education_text,
+        screener.extract_work_history, lambda document: screener.extract_project_details(document, screener.MASTER_SKILLS),
+    ]
+    stats = {name: collections.Counter() for name in PATTERNS}
+    names_by_pattern = {id(pattern): name for name, pattern in PATTERNS.items()}
+    # (module, attribute, name) of every registered pattern the extractors look up at call time
+    originals = [
+        (module, attribute, names_by_pattern[id(value)])
+        for module in (screener, date_ranges, resume_sections)
+        for attribute, value in list(vars(module).items())
+        if id(value) in names_by_pattern and value is PATTERNS[names_by_pattern[id(value)]]
+    ]
+    try:
+        for module, attribute, name in originals:
+            setattr(module, attribute, _TimedPattern(PATTERNS[name], stats[name]))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, text in texts:
+                # Segmentation is memoized per text; clear it so every run pays for it like a new resume
+                resume_sections.segment_resume.cache_clear()
+                document = ResumeDocument(text)
+                for extractor in extractors:
+                    extractor(document)
+        total_s = time.perf_counter() - start
+    finally:
+        for module, attribute, name in originals:
+            setattr(module, attribute, PATTERNS[name])
+
+    runs = repeat * len(texts)
+    results = sorted((
+        {
+            "pattern": name,
+            "calls_per_resume": round(counter["calls"] / runs, 1),
+            "us_per_resume": round(counter["seconds"] / runs * 1e6, 1),
+            "share": round(counter["seconds"] / total_s * 100, 1) if total_s else 0.0,
+        }
+        for name, counter in stats.items()
+    ), key=lambda row: row["us_per_resume"], reverse=True)
+
+    print(f"All extractors: {total_s / runs * 1000:.3f} ms/resume")
+    print(f"{'pattern':<24} {'calls/resume':>12} {'us/resume':>10} {'% of extractors':>16}")
+    for row in results:
+        print(f"{row['pattern']:<24} {row['calls_per_resume']:>12} {row['us_per_resume']:>10.1f} {row['share']:>15.1f}%")
+    used = {name for _, _, name in originals}
+    unused = [name for name in PATTERNS if name not in used]
+    if unused:
+        print(f"Not used by the screener, date_ranges or resume_sections modules: {', '.join(unused)}")
+    return results
+
+
+def benchmark_encode_batching(corpus_dir, model_name="all-MiniLM-L6-v2", repeat=3):
+    """
+    Texts/second of the screener's old fixed batch_size=128 encode call against token-budget
+    batching at each candidate budget and with the auto-tuner, on the same texts.
+    """
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    from embedding_batching import TOKEN_BUDGET_CANDIDATES, TokenBudgetTuner, encode_token_batched, token_lengths
+
+    texts = [text for _, text in _load_corpus_texts(corpus_dir)]
+    if not texts:
+        print(f"No readable resumes found in {corpus_dir}.")
+        return []
+    model = SentenceTransformer(model_name, device="cpu")
+    lengths = token_lengths(model, texts)
+    print(f"Loaded {len(texts)} resumes from {corpus_dir}; tokens per text: "
+          f"min {lengths.min()}, median {int(np.median(lengths))}, max {lengths.max()} (cap {model.max_seq_length}).")
+
+    def run(label, encode):
+        encode(texts[:8]) # Warm-up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            vectors = encode(texts)
+        elapsed = (time.perf_counter() - start) / repeat
+        return {"method": label, "texts_per_s": round(len(texts) / elapsed, 1), "seconds": round(elapsed, 3)}, vectors
+
+    baseline, reference = run("batch_size=128", lambda batch: model.encode(batch, batch_size=128, show_progress_bar=False))
+    results = [baseline]
+    for budget in TOKEN_BUDGET_CANDIDATES:
+        row, vectors = run(f"budget={budget}", lambda batch, budget=budget: encode_token_batched(model, batch, token_budget=budget))
+        row["max_abs_diff"] = float(np.abs(vectors - reference).max())
+        results.append(row)
+    tuner = TokenBudgetTuner()
+    row, vectors = run("auto-tuned", lambda batch: encode_token_batched(model, batch, tuner=tuner))
+    row["max_abs_diff"] = float(np.abs(vectors - reference).max())
+    row["chosen_budget"] = tuner.current()
+    results.append(row)
+
+    for row in results:
+        extra = f"  max |diff| {row['max_abs_diff']:.2e}" if "max_abs_diff" in row else ""
+        print(f"{row['method']:<16} {row['texts_per_s']:>9.1f} texts/s  ({row['seconds']:.3f}s){extra}")
+    print(f"Auto-tuner settled on a budget of {tuner.current()} tokens; throughput per budget: {tuner.stats()}")
+    return results
+
+
+def _run_embedding_backend(backend_name, model_name, sentences, repeat):
+    """Runs in a fresh process per backend, so its RSS is that backend's alone."""
+    import resource
+
+    import numpy as np
+    from embedding_backends import create_embedding_backend, embedding_backend_id
+    from worker_pool import _read_rss_bytes
+
+    model = create_embedding_backend(backend_name, model_name) # Exports/validates on first use
+    loaded_rss = _read_rss_bytes(os.getpid())
+    model.encode(sentences[:32], batch_size=32) # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vectors = model.encode(sentences, batch_size=32, show_progress_bar=False)
+    elapsed = (time.perf_counter() - start) / repeat
+    return {
+        "backend": backend_name,
+        "backend_id": embedding_backend_id(model),
+        "sentences_per_s": round(len(sentences) / elapsed, 1),
+        "loaded_rss_mb": round(loaded_rss / 2**20, 1) if loaded_rss else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1), # KiB on Linux
+    }, np.asarray(vectors, dtype=np.float32)
+
+
+def benchmark_embedding_backends(corpus_dir, model_name="all-MiniLM-L6-v2", backends=("torch", "onnx", "onnx-int8"),
+                                 max_sentences=2000, repeat=3):
+    """
+    Sentences/second and memory of each embedding backend on the corpus's resume lines,
+    and how far each backend's embeddings are from the PyTorch ones.
+    """
+    import multiprocessing
+
+    import numpy as np
+
+    sentences = [line.strip() for _, text in _load_corpus_texts(corpus_dir) for line in text.splitlines() if len(line.split()) >= 3]
+    sentences = sentences[:max_sentences]
+    if not sentences:
+        print(f"No readable resumes found in {corpus_dir}.")
+        return []
+    print(f"Encoding {len(sentences)} resume lines from {corpus_dir} with each backend.")
+
+    results = []
+    reference = None
+    context = multiprocessing.get_context("spawn")
+    for backend_name in backends:
+        with context.Pool(1) as pool:
+            row, vectors = pool.apply(_run_embedding_backend, (backend_name, model_name, sentences, repeat))
+        if reference is None:
+            reference = vectors
+        else:
+            cosine = (vectors * reference).sum(axis=1) / np.clip(
+                np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference, axis=1), 1e-12, None
+            )
+            row["min_cosine"] = float(cosine.min())
+            row["max_abs_diff"] = float(np.abs(vectors - reference).max())
+        results.append(row)
+
+    for row in results:
+        extra = f"  min cos {row['min_cosine']:.5f}, max |diff| {row['max_abs_diff']:.2e}" if "min_cosine" in row else ""
+        print(f"{row['backend']:<10} {row['backend_id']:<32} {row['sentences_per_s']:>9.1f} sentences/s  "
+              f"RSS {row['loaded_rss_mb']} MB loaded, {row['peak_rss_mb']} MB peak{extra}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScreenerPro performance benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    ocr_parser = subparsers.add_parser("ocr", help="Pages/second of each OCR backend on a scanned-resume corpus")
+    ocr_parser.add_argument("--corpus", required=True, help="Folder of scanned resume PDFs/images")
+    ocr_parser.add_argument("--dpi", type=int, default=200)
+    ocr_parser.add_argument("--config", default="--oem 1 --psm 3", help="Tesseract config string")
+
+    skills_parser = subparsers.add_parser("skills", help="Per-resume latency of skill extraction, compiled matcher vs. regex loop")
+    skills_parser.add_argument("--corpus", required=True, help="Folder of resumes (any format the screener accepts)")
+    skills_parser.add_argument("--repeat", type=int, default=5)
+
+    regex_parser = subparsers.add_parser("regex", help="Per-pattern time of the extractor regexes over a resume corpus")
+    regex_parser.add_argument("--corpus", required=True, help="Folder of resumes (any format the screener accepts)")
+    regex_parser.add_argument("--repeat", type=int, default=5)
+
+    encode_parser = subparsers.add_parser("encode", help="Texts/second of fixed-size vs. token-budget embedding batches")
+    encode_parser.add_argument("--corpus", required=True, help="Folder of resumes (any format the screener accepts)")
+    encode_parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    encode_parser.add_argument("--repeat", type=int, default=3)
+
+    backends_parser = subparsers.add_parser("embed-backends", help="Sentences/second, RSS and accuracy of each embedding backend")
+    backends_parser.add_argument("--corpus", required=True, help="Folder of resumes (any format the screener accepts)")
+    backends_parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    backends_parser.add_argument("--backends", default="torch,onnx,onnx-int8", help="Comma-separated; the first is the reference")
+    backends_parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.benchmark == "ocr":
+        benchmark_ocr_backends(args.corpus, dpi=args.dpi, config=args.config)
+    elif args.benchmark == "skills":
+        benchmark_skill_matcher(args.corpus, repeat=args.repeat)
+    elif args.benchmark == "regex":
+        benchmark_extractor_patterns(args.corpus, repeat=args.repeat)
+    elif args.benchmark == "encode":
+        benchmark_encode_batching(args.corpus, model_name=args.model, repeat=args.repeat)
+    elif args.benchmark == "embed-backends":
+        benchmark_embedding_backends(args.corpus, model_name=args.model, backends=args.backends.split(","), repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
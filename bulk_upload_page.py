@@ -2,8 +2,7 @@ import streamlit as st
 import pandas as pd
 import zipfile
 import os
-import tempfile
-import shutil
+import mimetypes
 from datetime import datetime, date
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -15,15 +14,17 @@ import uuid
 # Import all necessary functions and constants from screener.py
 # This ensures consistency in resume parsing and scoring logic
 from screener import (
-    extract_text_from_file, extract_years_of_experience, extract_email,
-    extract_phone_number, extract_location, extract_name, extract_cgpa,
+    extract_text_from_file, extract_years_of_experience_batch,
+    extract_location, extract_cheap_fields_batch,
     extract_education_text, extract_work_history, extract_project_details,
     extract_languages, format_work_history, format_project_details,
-    generate_concise_ai_suggestion, generate_detailed_hr_assessment,
-    semantic_score, MASTER_SKILLS, SKILL_CATEGORIES, create_mailto_link,
+    score_analyzed_resumes, MASTER_SKILLS, SKILL_CATEGORIES, create_mailto_link, extract_relevant_keywords,
     generate_certificate_pdf, send_certificate_email, generate_certificate_html,
+    extract_texts_concurrently, build_jd_profile, weighted_keyword_overlap, candidate_name_from_file,
+    clean_text, encode_texts, embed_resumes, global_ml_model,
     get_tesseract_cmd # Important for OCR setup
 )
+from resume_document import ResumeDocument
 
 # Ensure Tesseract is configured for OCR
 tesseract_cmd_path = get_tesseract_cmd()
@@ -34,7 +35,7 @@ if not tesseract_cmd_path:
 
 def bulk_upload_page(comprehensive_df: pd.DataFrame, jd_texts: dict):
     st.title("📦 Bulk Resume Import & Screening")
-    st.markdown("Upload a ZIP file containing multiple resumes (PDF, JPG, PNG) for automated batch processing.")
+    st.markdown("Upload a ZIP file containing multiple resumes (PDF, DOCX, TXT, RTF, JPG, PNG) for automated batch processing.")
 
     if 'bulk_comprehensive_df' not in st.session_state:
         st.session_state['bulk_comprehensive_df'] = pd.DataFrame(columns=[
@@ -62,7 +63,7 @@ def bulk_upload_page(comprehensive_df: pd.DataFrame, jd_texts: dict):
         if jd_option == "Upload my own":
             jd_file = st.file_uploader("Upload Job Description (TXT, PDF)", type=["txt", "pdf"], help="Upload a .txt or .pdf file containing the job description.", key="bulk_jd_file_uploader")
             if jd_file:
-                jd_text = extract_text_from_file(jd_file)
+                jd_text = extract_text_from_file(jd_file.read(), jd_file.name, jd_file.type)
                 jd_name_for_results = jd_file.name.replace('.pdf', '').replace('.txt', '')
             else:
                 jd_name_for_results = "Uploaded JD (No file selected)"
@@ -106,20 +107,16 @@ def bulk_upload_page(comprehensive_df: pd.DataFrame, jd_texts: dict):
             key="bulk_medium_priority_skills"
         )
 
-    zip_file = st.file_uploader("📂 **Upload Resumes ZIP File**", type=["zip"], help="Upload a .zip file containing multiple PDF, JPG, or PNG resumes.", key="zip_file_uploader")
+    zip_file = st.file_uploader("📂 **Upload Resumes ZIP File**", type=["zip"], help="Upload a .zip file containing multiple PDF, DOCX, TXT, RTF, JPG, or PNG resumes.", key="zip_file_uploader")
 
     if zip_file and jd_text:
         st.markdown("---")
         st.markdown("## 🚀 Processing Resumes...")
         
-        # Create a temporary directory to extract files
-        temp_dir = tempfile.mkdtemp()
-        processed_files = []
-
         try:
             with zipfile.ZipFile(zip_file, 'r') as zf:
                 # Filter for allowed file types within the zip
-                allowed_extensions = ['.pdf', '.jpg', '.jpeg', '.png']
+                allowed_extensions = ['.pdf', '.docx', '.txt', '.rtf', '.jpg', '.jpeg', '.png']
                 resume_files_in_zip = [
                     f for f in zf.namelist()
                     if not f.startswith('__MACOSX/') and # Exclude Mac specific hidden folders
@@ -128,95 +125,76 @@ def bulk_upload_page(comprehensive_df: pd.DataFrame, jd_texts: dict):
                 ]
 
                 if not resume_files_in_zip:
-                    st.warning("No valid resume files (PDF, JPG, PNG) found in the uploaded ZIP file.")
+                    st.warning("No valid resume files (PDF, DOCX, TXT, RTF, JPG, PNG) found in the uploaded ZIP file.")
                     return
 
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 results = []
 
-                for i, file_name_in_zip in enumerate(resume_files_in_zip):
-                    status_text.text(f"Extracting and processing: {file_name_in_zip} ({i+1}/{len(resume_files_in_zip)})...")
-                    
-                    # Extract the file to the temporary directory
-                    extracted_path = zf.extract(file_name_in_zip, temp_dir)
-                    
-                    # Read the extracted file content as bytes for extract_text_from_file
-                    with open(extracted_path, 'rb') as f_extracted:
-                        file_bytes = f_extracted.read()
-                    
-                    # Create a BytesIO object to simulate an uploaded file for extract_text_from_file
-                    from io import BytesIO
-                    uploaded_file_mock = BytesIO(file_bytes)
-                    uploaded_file_mock.name = os.path.basename(file_name_in_zip)
-                    uploaded_file_mock.type = f"application/{os.path.splitext(file_name_in_zip)[1].lstrip('.')}" if os.path.splitext(file_name_in_zip)[1] else "application/octet-stream"
-                    
-                    text = extract_text_from_file(uploaded_file_mock)
-                    
+                # A generator, so each member is decompressed, hashed and handed to shared memory
+                # in turn instead of the whole archive being held in memory at once
+                file_infos_for_extraction = (
+                    (zf.read(file_name_in_zip), os.path.basename(file_name_in_zip),
+                     mimetypes.guess_type(file_name_in_zip)[0] or "application/octet-stream")
+                    for file_name_in_zip in resume_files_in_zip
+                )
+
+                def _update_extraction_progress(done, total):
+                    status_text.text(f"Extracting text: {done}/{total} resumes...")
+                    progress_bar.progress(done / total)
+
+                # Resumes already extracted in an earlier run come straight from the extraction cache
+                extracted_texts_info = extract_texts_concurrently(file_infos_for_extraction, on_progress=_update_extraction_progress, total=len(resume_files_in_zip))
+                progress_bar.progress(0)
+
+                # The JD's skills and their weights are the same for every resume in the archive
+                jd_profile = build_jd_profile(
+                    jd_text, high_priority_skills, medium_priority_skills,
+                    embedding=encode_texts([clean_text(jd_text)])[0]
+                )
+
+                documents = [ResumeDocument(text) for _, text, _ in extracted_texts_info]
+                experience_years = extract_years_of_experience_batch(documents)
+                cheap_fields = extract_cheap_fields_batch(documents)
+
+                for i, (file_name_in_zip, text, _) in enumerate(extracted_texts_info):
+                    status_text.text(f"Processing: {file_name_in_zip} ({i+1}/{len(extracted_texts_info)})...")
+
                     if text.startswith("[ERROR]"):
                         st.error(f"Failed to process {file_name_in_zip}: {text.replace('[ERROR] ', '')}")
                         continue
 
                     # Reuse existing screening logic
-                    exp = extract_years_of_experience(text)
-                    email = extract_email(text)
-                    phone = extract_phone_number(text)
-                    location = extract_location(text)
-                    languages = extract_languages(text)
-                    education_details_text = extract_education_text(text)
-                    work_history_raw = extract_work_history(text)
-                    project_details_raw = extract_project_details(text, MASTER_SKILLS)
+                    document = documents[i]
+                    exp = experience_years[i]
+                    email = cheap_fields.at[i, "email"]
+                    phone = cheap_fields.at[i, "phone"]
+                    location = extract_location(document)
+                    languages = extract_languages(document)
+                    education_details_text = extract_education_text(document)
+                    work_history_raw = extract_work_history(document)
+                    project_details_raw = extract_project_details(document, MASTER_SKILLS)
                     
                     education_details_formatted = education_details_text
                     work_history_formatted = format_work_history(work_history_raw)
                     project_details_formatted = format_project_details(project_details_raw)
 
-                    candidate_name = extract_name(text) or os.path.basename(file_name_in_zip).replace('.pdf', '').replace('.jpg', '').replace('.jpeg', '').replace('.png', '').replace('_', ' ').title()
-                    cgpa = extract_cgpa(text)
+                    candidate_name = cheap_fields.at[i, "name"] or candidate_name_from_file(file_name_in_zip)
+                    cgpa = cheap_fields.at[i, "cgpa"]
 
-                    resume_raw_skills_set, resume_categorized_skills = extract_relevant_keywords(text, MASTER_SKILLS)
-                    jd_raw_skills_set, jd_categorized_skills = extract_relevant_keywords(jd_text, MASTER_SKILLS)
+                    resume_raw_skills_set, resume_categorized_skills = extract_relevant_keywords(document, MASTER_SKILLS)
+                    jd_categorized_skills = jd_profile.categorized_skills
 
-                    matched_keywords = list(resume_raw_skills_set.intersection(jd_raw_skills_set))
-                    missing_skills = list(jd_raw_skills_set.difference(resume_raw_skills_set))
+                    matched_keywords = list(resume_raw_skills_set.intersection(jd_profile.skills))
+                    missing_skills = list(jd_profile.skills.difference(resume_raw_skills_set))
 
-                    score, semantic_similarity = semantic_score(text, jd_text, exp, cgpa, high_priority_skills, medium_priority_skills)
-                    
-                    concise_ai_suggestion = generate_concise_ai_suggestion(
-                        candidate_name=candidate_name,
-                        score=score,
-                        years_exp=exp,
-                        semantic_similarity=semantic_similarity,
-                        cgpa=cgpa
-                    )
-
-                    detailed_hr_assessment = generate_detailed_hr_assessment(
-                        candidate_name=candidate_name,
-                        score=score,
-                        years_exp=exp,
-                        semantic_similarity=semantic_similarity,
-                        cgpa=cgpa,
-                        jd_text=jd_text,
-                        resume_text=text,
-                        matched_keywords=matched_keywords,
-                        missing_skills=missing_skills,
-                        max_exp_cutoff=max_experience
-                    )
-
-                    certificate_id = str(uuid.uuid4())
-                    certificate_rank = "Not Applicable"
-
-                    if score >= 90:
-                        certificate_rank = "🏅 Elite Match"
-                    elif score >= 80:
-                        certificate_rank = "⭐ Strong Match"
-                    elif score >= 75:
-                        certificate_rank = "✅ Good Fit"
+                    weighted_keyword_overlap_score = weighted_keyword_overlap(jd_profile, resume_raw_skills_set)
 
                     results.append({
                         "File Name": os.path.basename(file_name_in_zip),
                         "Candidate Name": candidate_name,
-                        "Score (%)": score,
+                        "Score (%)": None, # Score-dependent fields are filled in by score_analyzed_resumes()
                         "Years Experience": exp,
                         "CGPA (4.0 Scale)": cgpa,
                         "Email": email or "Not Found",
@@ -226,29 +204,30 @@ def bulk_upload_page(comprehensive_df: pd.DataFrame, jd_texts: dict):
                         "Education Details": education_details_formatted,
                         "Work History": work_history_formatted,
                         "Project Details": project_details_formatted,
-                        "AI Suggestion": concise_ai_suggestion,
-                        "Detailed HR Assessment": detailed_hr_assessment,
+                        "AI Suggestion": None,
+                        "Detailed HR Assessment": None,
                         "Matched Keywords": ", ".join(matched_keywords),
                         "Missing Skills": ", ".join(missing_skills),
                         "Matched Keywords (Categorized)": dict(resume_categorized_skills),
                         "Missing Skills (Categorized)": dict(jd_categorized_skills),
-                        "Semantic Similarity": semantic_similarity,
+                        "Semantic Similarity": None,
                         "Resume Raw Text": text,
                         "JD Used": jd_name_for_results,
                         "Date Screened": datetime.now().date(),
-                        "Certificate ID": certificate_id,
-                        "Certificate Rank": certificate_rank
+                        "Certificate ID": str(uuid.uuid4()),
+                        "Certificate Rank": None,
+                        "Tag": None,
+                        "_keyword_overlap": weighted_keyword_overlap_score
                     })
-                    progress_bar.progress((i + 1) / len(resume_files_in_zip))
+                    progress_bar.progress((i + 1) / len(extracted_texts_info))
+
+                # All resumes are embedded and scored in one batch, then tagged and ranked
+                if results:
+                    status_text.text(f"Scoring {len(results)} resumes...")
+                    resume_embeddings = embed_resumes([row["Resume Raw Text"] for row in results], jd_profile.embedding)
+                    score_analyzed_resumes(results, resume_embeddings, jd_profile.embedding, max_experience, global_ml_model)
                 
                 st.session_state['bulk_comprehensive_df'] = pd.DataFrame(results).sort_values(by="Score (%)", ascending=False).reset_index(drop=True)
-                
-                st.session_state['bulk_comprehensive_df']['Tag'] = st.session_state['bulk_comprehensive_df'].apply(lambda row: 
-                    "👑 Exceptional Match" if row['Score (%)'] >= 90 and row['Years Experience'] >= 5 and row['Years Experience'] <= max_experience and row['Semantic Similarity'] >= 0.85 and (row['CGPA (4.0 Scale)'] is None or row['CGPA (4.0 Scale)'] >= 3.5) else (
-                    "🔥 Strong Candidate" if row['Score (%)'] >= 80 and row['Years Experience'] >= 3 and row['Years Experience'] <= max_experience and row['Semantic Similarity'] >= 0.7 and (row['CGPA (4.0 Scale)'] is None or row['CGPA (4.0 Scale)'] >= 3.0) else (
-                    "✨ Promising Fit" if row['Score (%)'] >= 60 and row['Years Experience'] >= 1 and row['Years Experience'] <= max_experience and (row['CGPA (4.0 Scale)'] is None or row['CGPA (4.0 Scale)'] >= 2.5) else (
-                    "⚠️ Needs Review" if row['Score (%)'] >= 40 else 
-                    "❌ Limited Match"))), axis=1)
 
                 st.success(f"✅ Successfully processed {len(results)} resumes from the ZIP file!")
                 progress_bar.empty()
@@ -258,11 +237,6 @@ def bulk_upload_page(comprehensive_df: pd.DataFrame, jd_texts: dict):
             st.error("❌ The uploaded file is not a valid ZIP file.")
         except Exception as e:
             st.error(f"An unexpected error occurred during ZIP processing: {e}")
-        finally:
-            # Clean up the temporary directory
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-                st.info("Cleaned up temporary files.")
 
 
     st.markdown("---")
@@ -0,0 +1,95 @@
+import numpy as np
+
+from resume_sections import segment_resume
+
+# --- Chunked embeddings for long resumes ---
+# all-MiniLM-L6-v2 truncates its input at 256 word pieces, so a whole-document embedding of
+# a multi-page resume only covers its first few paragraphs. In chunked mode each resume is
+# split along its sections into windows that fit the model, the chunks of every resume are
+# encoded together in one pass (through the embedding store, so known chunks are not
+# re-encoded), and each resume's chunk vectors are pooled back into one vector:
+#   "mean": average of the chunk vectors
+#   "max":  element-wise maximum of the chunk vectors
+#   "best": the chunk most similar to the job description, so scoring compares the JD
+#           against the most relevant part of the resume
+
+# ~160 words stay under the model's 256 word pieces for typical resume English
+CHUNK_WORDS = 160
+CHUNK_OVERLAP_WORDS = 32
+POOLING_MODES = ("mean", "max", "best")
+
+
+def _word_windows(words, max_words, overlap):
+    step = max(max_words - overlap, 1)
+    return [words[start:start + max_words] for start in range(0, max(len(words) - overlap, 1), step)]
+
+
+def chunk_resume(text, max_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP_WORDS):
+    """
+    Splits a resume into chunks of at most max_words words. Consecutive sections are
+    packed into one chunk while they fit; a longer section is cut into overlapping windows.
+    """
+    sections = list(segment_resume(text))
+    pieces = [text[:sections[0].header_start]] if sections else [text]
+    pieces.extend(text[section.header_start:section.end] for section in sections)
+
+    chunks = []
+    current = []
+    for piece in pieces:
+        words = piece.split()
+        if not words:
+            continue
+        if len(words) > max_words:
+            if current:
+                chunks.append(" ".join(current))
+                current = []
+            chunks.extend(" ".join(window) for window in _word_windows(words, max_words, overlap))
+        elif len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = words
+        else:
+            current.extend(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks or [text]
+
+
+def pool_chunk_embeddings(chunk_vectors, chunk_counts, pooling="mean", jd_embedding=None):
+    """
+    Pools the chunk vectors of each document into one vector per document.
+    chunk_vectors: (total_chunks, dim), grouped by document in order.
+    chunk_counts:  number of chunks of each document (all at least 1).
+    """
+    if pooling not in POOLING_MODES:
+        raise ValueError(f"Unknown pooling mode {pooling!r}; expected one of {', '.join(POOLING_MODES)}")
+    chunk_vectors = np.asarray(chunk_vectors, dtype=np.float32)
+    chunk_counts = np.asarray(chunk_counts, dtype=np.int64)
+    if len(chunk_counts) == 0:
+        return np.empty((0, chunk_vectors.shape[-1] if chunk_vectors.ndim == 2 else 0), dtype=np.float32)
+    starts = np.concatenate([[0], np.cumsum(chunk_counts)[:-1]])
+    if pooling == "mean":
+        return np.add.reduceat(chunk_vectors, starts, axis=0) / chunk_counts[:, None]
+    if pooling == "max":
+        return np.maximum.reduceat(chunk_vectors, starts, axis=0)
+
+    if jd_embedding is None:
+        raise ValueError("Best-chunk pooling needs the job description embedding")
+    # Cosine similarity of every chunk with the JD in one matrix-vector product
+    jd = np.asarray(jd_embedding, dtype=np.float32)
+    norms = np.linalg.norm(chunk_vectors, axis=1) * (np.linalg.norm(jd) or 1.0)
+    similarities = chunk_vectors @ jd / np.where(norms == 0, 1.0, norms)
+    best = [start + int(np.argmax(similarities[start:start + count])) for start, count in zip(starts, chunk_counts)]
+    return chunk_vectors[best]
+
+
+def embed_documents_chunked(texts, encode_fn, pooling="mean", jd_embedding=None,
+                            max_words=CHUNK_WORDS, overlap=CHUNK_OVERLAP_WORDS):
+    """
+    One pooled embedding per text. encode_fn gets the chunks of all texts as one list and
+    returns their embeddings (e.g. screener.encode_texts, which reads known chunks from the
+    embedding store).
+    """
+    chunked = [chunk_resume(text, max_words, overlap) for text in texts]
+    all_chunks = [chunk for chunks in chunked for chunk in chunks]
+    chunk_vectors = encode_fn(all_chunks)
+    return pool_chunk_embeddings(chunk_vectors, [len(chunks) for chunks in chunked], pooling, jd_embedding)
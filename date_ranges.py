@@ -0,0 +1,83 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from extractor_patterns import register_pattern
+
+# --- Employment date ranges ---
+# Resumes list roles as "Jan 2020 - Present", "March 2018 to Dec 2019" or "2016 - 2018".
+# Dates are turned into month indices (year * 12 + month - 1) and each role into a half-open
+# interval [start, end), so overlapping or concurrent roles are merged before their months
+# are counted instead of being added up twice.
+
+MONTH_TOKENS = {}
+for _number, _name in enumerate(["january", "february", "march", "april", "may", "june", "july",
+                                 "august", "september", "october", "november", "december"], 1):
+    MONTH_TOKENS[_name] = _number
+    MONTH_TOKENS[_name[:3]] = _number
+MONTH_TOKENS["sept"] = 9
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_DATE = r'\b(?:' + _MONTH + r'\s*)?\d{4}'
+# Applied to lowercased text. One pattern covers every mix of "month year" and year-only
+# dates, so the year of "oct 2025 - present" is never matched again on its own as a range
+# starting in January.
+DATE_RANGE_PATTERN = register_pattern("DATE_RANGE_PATTERN", r'(' + _DATE + r')\s*[-to]+\s*(present|' + _DATE + r')')
+
+
+@lru_cache(maxsize=4096)
+def parse_month_year(token, default_month=1):
+    """
+    Month index of a "jan 2020" / "january 2020" / "2020" token, or None if it is not a date.
+    Year-only tokens fall on `default_month` (January for starts, December for ends).
+    """
+    parts = re.sub(r'[,\.\s]+', ' ', token).strip().lower().split()
+    if len(parts) == 1 and parts[0].isdigit():
+        return int(parts[0]) * 12 + default_month - 1
+    if len(parts) == 2 and parts[1].isdigit() and parts[0] in MONTH_TOKENS:
+        return int(parts[1]) * 12 + MONTH_TOKENS[parts[0]] - 1
+    return None
+
+
+def month_index(date):
+    return date.year * 12 + date.month - 1
+
+
+def find_date_ranges(text, now=None):
+    """(start, end) month-index intervals of the date ranges in lowercased text, clipped to `now`."""
+    current = month_index(now or datetime.now())
+    ranges = []
+    for start_str, end_str in DATE_RANGE_PATTERN.findall(text):
+        start = parse_month_year(start_str, 1)
+        if start is None or start > current:
+            continue
+        end = current if 'present' in end_str else parse_month_year(end_str, 12)
+        if end is None:
+            continue
+        end = min(end, current)
+        if end > start:
+            ranges.append((start, end))
+    return ranges
+
+
+def merge_intervals(intervals):
+    """Union of half-open intervals, as a sorted list of disjoint (start, end) pairs."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def total_experience_months(text, now=None):
+    """Months covered by the union of all date ranges in lowercased text."""
+    return sum(end - start for start, end in merge_intervals(find_date_ranges(text, now)))
+
+
+def total_experience_months_batch(texts, now=None):
+    """total_experience_months() for many texts, all measured against the same `now`."""
+    now = now or datetime.now()
+    return [total_experience_months(text, now) for text in texts]
@@ -0,0 +1,211 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+# --- Sentence embedding backends ---
+# "torch" is the SentenceTransformer model as published. "onnx" exports its transformer
+# once to ONNX and runs it on ONNX Runtime's CPU provider, which needs neither autograd nor
+# the PyTorch runtime per call; "onnx-int8" additionally quantizes the exported weights
+# to int8 (dynamic quantization), which is faster again and much smaller in memory.
+# An export is only used after its embeddings have been checked against the PyTorch model's
+# on VALIDATION_SENTENCES; if they are not within tolerance we fall back to "torch".
+# Every backend exposes the subset of the SentenceTransformer API the screener uses:
+# encode(), get_sentence_embedding_dimension(), tokenizer and max_seq_length.
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+EMBEDDING_BACKEND = os.environ.get("SCREENER_EMBEDDING_BACKEND", "torch")
+ONNX_EXPORT_DIR = os.environ.get("SCREENER_ONNX_DIR", os.path.join(".cache", "onnx"))
+ONNX_OPSET = 17
+# Lowest cosine similarity to the PyTorch embedding accepted for any validation sentence
+MIN_COSINE = {"onnx": 0.9999, "onnx-int8": 0.99}
+
+VALIDATION_SENTENCES = [
+    "Senior data scientist with 6 years of experience in Python, SQL and machine learning.",
+    "Led a team of five engineers building microservices on AWS with Docker and Kubernetes.",
+    "B.Tech in Computer Science, Alliance University, Bangalore - 2021. CGPA 8.4/10.",
+    "Skills: React, Node.js, TypeScript, GraphQL, PostgreSQL, CI/CD",
+    "Looking for a backend developer to design scalable APIs and mentor junior developers.",
+    "Registered nurse, 8 years of patient care, diagnostics and medical records management.",
+    "Projects",
+    "",
+]
+
+
+class OnnxSentenceEncoder:
+    """A SentenceTransformer exported to ONNX: tokenizer, transformer session, pooling."""
+
+    def __init__(self, export_dir, quantized=False):
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(export_dir, "config.json")) as f:
+            self.config = json.load(f)
+        self.quantized = quantized
+        self.backend_id = f"onnx-{'int8' if quantized else 'fp32'}-ort{onnxruntime.__version__}"
+        self.max_seq_length = self.config["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        model_path = os.path.join(export_dir, "model.int8.onnx" if quantized else "model.onnx")
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = [model_input.name for model_input in self.session.get_inputs()]
+        self._lock = threading.Lock()
+
+    def get_sentence_embedding_dimension(self):
+        return self.config["dim"]
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, **kwargs):
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        embeddings = np.empty((len(sentences), self.config["dim"]), dtype=np.float32)
+        for start in range(0, len(sentences), batch_size):
+            embeddings[start:start + batch_size] = self._encode_batch(sentences[start:start + batch_size])
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, sentences):
+        encoded = self.tokenizer(sentences, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np")
+        feeds = {name: encoded[name].astype(np.int64) for name in self._input_names if name in encoded}
+        if "token_type_ids" in self._input_names and "token_type_ids" not in feeds:
+            feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+        with self._lock:
+            token_embeddings = self.session.run(None, feeds)[0]
+
+        mask = encoded["attention_mask"].astype(np.float32)[:, :, None]
+        if self.config["pooling"] == "cls":
+            pooled = token_embeddings[:, 0]
+        else:
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config["normalize"]:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+
+def _export_dir(model_name):
+    return os.path.join(ONNX_EXPORT_DIR, re.sub(r'[^A-Za-z0-9._-]+', '_', model_name))
+
+
+def export_onnx(model, export_dir):
+    """Exports a loaded SentenceTransformer's transformer, tokenizer and pooling settings."""
+    import torch
+    from sentence_transformers.models import Normalize, Pooling
+
+    pooling = next((module for module in model if isinstance(module, Pooling)), None)
+    pooling_mode = pooling.get_pooling_mode_str() if pooling is not None else "mean"
+    if pooling_mode not in ("mean", "cls"):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling_mode}")
+
+    class _TokenEmbeddings(torch.nn.Module):
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask,
+                                    token_type_ids=token_type_ids)[0]
+
+    os.makedirs(export_dir, exist_ok=True)
+    sample = model.tokenizer(["export sample"], padding=True, return_tensors="pt")
+    token_type_ids = sample.get("token_type_ids", torch.zeros_like(sample["input_ids"]))
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ("input_ids", "attention_mask", "token_type_ids", "token_embeddings")}
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(model[0].auto_model.eval()),
+            (sample["input_ids"], sample["attention_mask"], token_type_ids),
+            os.path.join(export_dir, "model.onnx"),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+        )
+    model.tokenizer.save_pretrained(export_dir)
+    with open(os.path.join(export_dir, "config.json"), "w") as f:
+        json.dump({
+            "pooling": pooling_mode,
+            "normalize": any(isinstance(module, Normalize) for module in model),
+            "max_seq_length": model.max_seq_length,
+            "dim": model.get_sentence_embedding_dimension(),
+            "validated": {},
+        }, f, indent=2)
+
+
+def quantize_onnx(export_dir):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(os.path.join(export_dir, "model.onnx"), os.path.join(export_dir, "model.int8.onnx"),
+                     weight_type=QuantType.QInt8)
+
+
+def compare_embeddings(candidate, reference, sentences=VALIDATION_SENTENCES):
+    """Lowest per-sentence cosine similarity and largest absolute difference between two backends."""
+    a = np.asarray(candidate.encode(sentences), dtype=np.float32)
+    b = np.asarray(reference.encode(sentences), dtype=np.float32)
+    cosine = (a * b).sum(axis=1) / np.clip(np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1), 1e-12, None)
+    return {"min_cosine": float(cosine.min()), "max_abs_diff": float(np.abs(a - b).max())}
+
+
+def _load_onnx_encoder(backend_name, model_name):
+    """Exports, quantizes and validates on first use; later loads skip PyTorch entirely."""
+    export_dir = _export_dir(model_name)
+    config_path = os.path.join(export_dir, "config.json")
+    quantized = backend_name == "onnx-int8"
+    validated = {}
+    if os.path.exists(config_path):
+        with open(config_path) as f:
+            validated = json.load(f).get("validated", {})
+
+    if backend_name not in validated:
+        from sentence_transformers import SentenceTransformer
+
+        reference = SentenceTransformer(model_name, device="cpu")
+        if not os.path.exists(os.path.join(export_dir, "model.onnx")):
+            export_onnx(reference, export_dir)
+        if quantized and not os.path.exists(os.path.join(export_dir, "model.int8.onnx")):
+            quantize_onnx(export_dir)
+        result = compare_embeddings(OnnxSentenceEncoder(export_dir, quantized), reference)
+        result["passed"] = result["min_cosine"] >= MIN_COSINE[backend_name]
+        with open(config_path) as f:
+            config = json.load(f)
+        config["validated"][backend_name] = result
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+        validated = config["validated"]
+        print(f"Validated {backend_name} export of {model_name} against PyTorch: {result}")
+
+    if not validated[backend_name]["passed"]:
+        raise ValueError(f"{backend_name} embeddings differ from PyTorch beyond tolerance: {validated[backend_name]}")
+    return OnnxSentenceEncoder(export_dir, quantized)
+
+
+def create_embedding_backend(backend_name=None, model_name="all-MiniLM-L6-v2"):
+    backend_name = backend_name or EMBEDDING_BACKEND
+    if backend_name in ("onnx", "onnx-int8"):
+        if onnxruntime is not None:
+            try:
+                return _load_onnx_encoder(backend_name, model_name)
+            except Exception as e:
+                print(f"WARNING: Could not use the {backend_name} embedding backend ({e}). Falling back to PyTorch.")
+        else:
+            print(f"WARNING: SCREENER_EMBEDDING_BACKEND={backend_name} but onnxruntime is not installed. Falling back to PyTorch.")
+    elif backend_name != "torch":
+        print(f"WARNING: Unknown embedding backend '{backend_name}'. Falling back to PyTorch.")
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def embedding_backend_id(model):
+    """Identifies the backend (and its version) that produced a model's embeddings."""
+    backend_id = getattr(model, "backend_id", None)
+    if backend_id is None:
+        import sentence_transformers
+
+        backend_id = f"sentence-transformers-{sentence_transformers.__version__}"
+    return backend_id
@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# --- Token-budget batching for sentence embeddings ---
+# A fixed batch_size mixes one-line OCR fragments with multi-page CVs: every batch is padded
+# to its longest text, so most of the work on short texts is padding. Texts are instead
+# ordered by token length and grouped so that batch size x longest text stays under a token
+# budget, giving many short texts per batch and few long ones. The best budget depends on
+# the host CPU, so TokenBudgetTuner measures padded tokens per second for each candidate
+# budget on the first batches it sees and then keeps the fastest.
+
+TOKEN_BUDGET_CANDIDATES = (2048, 4096, 8192, 16384)
+# Tokens to measure per candidate before its throughput is trusted
+TUNING_MIN_TOKENS = 20_000
+MAX_BATCH_SIZE = 256
+
+
+def token_lengths(model, texts):
+    """Token counts as the model will see them (special tokens included, truncated)."""
+    tokenizer = getattr(model, "tokenizer", None)
+    max_length = getattr(model, "max_seq_length", None) or 512
+    if tokenizer is None:
+        return np.array([min(max(len(text) // 4, 1) + 2, max_length) for text in texts])
+    encoded = tokenizer(list(texts), add_special_tokens=True, truncation=True, max_length=max_length)
+    return np.array([len(ids) for ids in encoded["input_ids"]])
+
+
+class TokenBudgetTuner:
+    """Tries each candidate budget on live batches, then settles on the fastest."""
+
+    def __init__(self, candidates=TOKEN_BUDGET_CANDIDATES, min_tokens=TUNING_MIN_TOKENS, fixed_budget=None):
+        self.candidates = list(candidates)
+        self.min_tokens = min_tokens
+        self.fixed_budget = fixed_budget
+        self._tokens = dict.fromkeys(self.candidates, 0)
+        self._seconds = dict.fromkeys(self.candidates, 0.0)
+        self._lock = threading.Lock()
+
+    def current(self):
+        if self.fixed_budget:
+            return self.fixed_budget
+        with self._lock:
+            for budget in self.candidates:
+                if self._tokens[budget] < self.min_tokens:
+                    return budget
+            return max(self.candidates, key=self._throughput)
+
+    def record(self, budget, padded_tokens, seconds):
+        with self._lock:
+            if budget in self._tokens:
+                self._tokens[budget] += padded_tokens
+                self._seconds[budget] += seconds
+
+    def _throughput(self, budget):
+        return self._tokens[budget] / self._seconds[budget] if self._seconds[budget] else 0.0
+
+    def stats(self):
+        with self._lock:
+            return {budget: round(self._throughput(budget)) for budget in self.candidates if self._tokens[budget]}
+
+
+def _next_batch(order, lengths, start, budget, max_batch_size):
+    """End of the batch starting at order[start]; order is by descending length."""
+    longest = max(int(lengths[order[start]]), 1)
+    size = max(1, min(budget // longest, max_batch_size))
+    return min(start + size, len(order))
+
+
+def encode_token_batched(model, texts, tuner=None, token_budget=None, max_batch_size=MAX_BATCH_SIZE):
+    """
+    model.encode(texts) in batches sized by a token budget; returns the embeddings as an
+    array in the order of `texts`. The budget comes from `token_budget` or, if not given,
+    from `tuner` (which is fed the measured throughput of every batch).
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    lengths = token_lengths(model, texts)
+    order = np.argsort(-lengths, kind="stable")
+
+    embeddings = None
+    start = 0
+    while start < len(order):
+        budget = token_budget or (tuner.current() if tuner is not None else TOKEN_BUDGET_CANDIDATES[-1])
+        end = _next_batch(order, lengths, start, budget, max_batch_size)
+        batch = order[start:end]
+        batch_start = time.perf_counter()
+        vectors = model.encode([texts[i] for i in batch], batch_size=len(batch), show_progress_bar=False)
+        if tuner is not None and token_budget is None:
+            tuner.record(budget, len(batch) * int(lengths[batch[0]]), time.perf_counter() - batch_start)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if embeddings is None:
+            embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        embeddings[batch] = vectors # Back to the callers' order
+        start = end
+    return embeddings
+
+
+def default_token_budget():
+    """SCREENER_ENCODE_TOKEN_BUDGET pins the budget; unset (or 0) means auto-tune."""
+    return int(os.environ.get("SCREENER_ENCODE_TOKEN_BUDGET", "0")) or None
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# --- Disk-backed store for text embeddings ---
+# Embeddings are keyed by a hash of the whitespace-normalized text, and each model gets its
+# own directory, so vectors from different models (or versions of one) never mix. Vectors
+# live in one float32 matrix file that is only ever appended to and is read through a memory
+# map; a SQLite index maps each text hash to its row. Rows whose entries were dropped are
+# reclaimed by compact(), which rewrites the matrix with only the rows still indexed.
+
+DEFAULT_STORE_DIR = os.path.join(".cache", "embeddings")
+DEFAULT_MAX_ROWS = 200_000
+# Compaction trims to this share of max_rows, so a full store is not rewritten on every put()
+COMPACT_LOW_WATER = 0.9
+
+
+def text_key(text):
+    """Content hash of a text with runs of whitespace collapsed and the ends stripped."""
+    normalized = re.sub(r'\s+', ' ', text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _model_dir_name(model_id):
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', model_id)
+
+
+class EmbeddingStore:
+    def __init__(self, model_id, dim, store_dir=DEFAULT_STORE_DIR, max_rows=DEFAULT_MAX_ROWS):
+        """
+        model_id: name and version of the model the vectors come from, e.g.
+                  "all-MiniLM-L6-v2@2.7.0"; a new id starts a new, empty store.
+        dim:      embedding width.
+        max_rows: entries kept; past it, compact() drops the least recently used down to
+                  COMPACT_LOW_WATER * max_rows.
+        """
+        self.model_id = model_id
+        self.dim = dim
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._matrix = None # Memory map of the matrix file, reopened after it grows
+
+        self.store_dir = os.path.join(store_dir, _model_dir_name(model_id))
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._matrix_path = os.path.join(self.store_dir, f"vectors_{dim}.f32")
+        self._conn = sqlite3.connect(os.path.join(self.store_dir, "index.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            "key TEXT PRIMARY KEY, row INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_rows_last_access ON rows(last_access)")
+        self._conn.commit()
+
+    # --- Matrix file ---
+    def _row_count(self):
+        try:
+            return os.path.getsize(self._matrix_path) // (4 * self.dim)
+        except OSError:
+            return 0
+
+    def _rows(self, row_numbers):
+        rows = self._row_count()
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r", shape=(rows, self.dim)) if rows else None
+        return np.array(self._matrix[row_numbers]) if len(row_numbers) else np.empty((0, self.dim), np.float32)
+
+    # --- Lookup and insert ---
+    def _indexed_rows(self, keys):
+        """{key: row} for the keys that are in the index."""
+        rows = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500): # SQLite caps the number of bound parameters
+            batch = keys[start:start + 500]
+            rows.update(self._conn.execute(
+                f"SELECT key, row FROM rows WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall())
+        return rows
+
+    def lookup(self, keys):
+        """
+        Returns (vectors, found): an (n, dim) float32 array in the order of `keys`, and a
+        boolean mask of the keys that were in the store (their rows are zero otherwise).
+        """
+        vectors = np.zeros((len(keys), self.dim), dtype=np.float32)
+        found = np.zeros(len(keys), dtype=bool)
+        if not keys:
+            return vectors, found
+        with self._lock:
+            rows = self._indexed_rows(set(keys))
+            if rows:
+                self._conn.executemany("UPDATE rows SET last_access = ? WHERE key = ?", [(time.time(), key) for key in rows])
+                self._conn.commit()
+            positions = [i for i, key in enumerate(keys) if key in rows]
+            vectors[positions] = self._rows([rows[keys[i]] for i in positions])
+        found[positions] = True
+        self.hits += len(positions)
+        self.misses += len(keys) - len(positions)
+        return vectors, found
+
+    def put(self, keys, vectors):
+        """Appends vectors for keys that are not stored yet."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        with self._lock:
+            new = {}
+            for key, vector in zip(keys, vectors):
+                new.setdefault(key, vector)
+            stored = self._indexed_rows(new)
+            new = {key: vector for key, vector in new.items() if key not in stored}
+            if not new:
+                return
+            first_row = self._row_count()
+            with open(self._matrix_path, "ab") as f:
+                f.write(np.stack(list(new.values())).astype(np.float32).tobytes())
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (key, row, last_access) VALUES (?, ?, ?)",
+                [(key, first_row + i, now) for i, key in enumerate(new)]
+            )
+            self._conn.commit()
+        if self._row_count() > self.max_rows:
+            self.compact(int(self.max_rows * COMPACT_LOW_WATER))
+
+    def encode(self, texts, encode_fn):
+        """
+        Embeddings of `texts` in order. Only texts missing from the store are passed to
+        encode_fn (once each, as one list); their vectors are then stored.
+        """
+        keys = [text_key(text) for text in texts]
+        vectors, found = self.lookup(keys)
+        if not found.all():
+            missing = {}
+            for i in np.flatnonzero(~found):
+                missing.setdefault(keys[i], []).append(i)
+            missing_texts = [texts[positions[0]] for positions in missing.values()]
+            encoded = np.asarray(encode_fn(missing_texts), dtype=np.float32).reshape(len(missing_texts), self.dim)
+            for vector, positions in zip(encoded, missing.values()):
+                vectors[positions] = vector
+            self.put(list(missing), encoded)
+        return vectors
+
+    # --- Maintenance ---
+    def compact(self, max_rows=None):
+        """
+        Rewrites the matrix with only the indexed rows, dropping the least recently used
+        entries beyond max_rows (the store's limit by default). Returns the rows kept.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        with self._lock:
+            entries = self._conn.execute("SELECT key, row FROM rows ORDER BY last_access DESC").fetchall()
+            kept, dropped = entries[:max_rows], entries[max_rows:]
+            kept.sort(key=lambda entry: entry[1]) # Copy rows in file order
+            vectors = self._rows([row for _, row in kept])
+            temp_path = self._matrix_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(vectors.tobytes())
+            self._matrix = None
+            os.replace(temp_path, self._matrix_path)
+            self._conn.executemany("DELETE FROM rows WHERE key = ?", [(key,) for key, _ in dropped])
+            self._conn.executemany("UPDATE rows SET row = ? WHERE key = ?", [(i, key) for i, (key, _) in enumerate(kept)])
+            self._conn.commit()
+        return len(kept)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM rows")
+            self._conn.commit()
+            self._matrix = None
+            if os.path.exists(self._matrix_path):
+                os.remove(self._matrix_path)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Returns hit/miss counters and the size of the matrix file."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+        lookups = self.hits + self.misses
+        rows = self._row_count()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "dead_rows": rows - entries,
+            "size_bytes": rows * self.dim * 4,
+        }
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- Disk-backed cache for resume text extraction ---
+# Entries are keyed by a hash of the raw file bytes plus the extractor version and
+# Tesseract configuration, so any change to the extraction logic naturally invalidates
+# old entries. Storage is a single SQLite file; eviction is least-recently-used once the
+# total payload size goes over the configured limit.
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "extraction")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def make_cache_key(file_bytes, extractor_version, tesseract_config):
+    """Returns a content-addressed key for a file and the extractor settings used on it."""
+    digest = hashlib.sha256()
+    digest.update(f"{extractor_version}|{tesseract_config}|".encode("utf-8"))
+    digest.update(file_bytes)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "extraction_cache.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Returns the cached payload for `key`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, payload):
+        """Stores a JSON-serialisable payload and evicts old entries if over the size limit."""
+        encoded = json.dumps(payload)
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, encoded, size, time.time())
+            )
+            self._evict_if_needed()
+            self._conn.commit()
+
+    def _evict_if_needed(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Returns hit/miss counters and the current on-disk footprint."""
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,84 @@
+import re
+
+# --- Compiled extractor patterns ---
+# Every regex the screener's field extractors run is compiled once here, at import, under
+# the name it is used by. PATTERNS maps those names to the compiled patterns, so
+# `python benchmarks.py regex` can time each of them over a resume corpus. Patterns built
+# from another module's tables (date ranges, section headers) stay next to those tables and
+# are added with register_pattern().
+
+PATTERNS = {}
+
+
+def _register(name, pattern, flags=0):
+    PATTERNS[name] = compiled = re.compile(pattern, flags)
+    return compiled
+
+
+def register_pattern(name, pattern, flags=0):
+    """Compiles a pattern defined in another module and adds it to PATTERNS."""
+    return _register(name, pattern, flags)
+
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+
+# Years of experience (the date ranges themselves are parsed in date_ranges)
+EXPERIENCE_SEPARATORS = _register("EXPERIENCE_SEPARATORS", r'[\:\,\–—]+')
+YEARS_PHRASE = _register("YEARS_PHRASE", r'(\d+(?:\.\d+)?)\s*(\+)?\s*(year|yrs|years)\b')
+EXPERIENCE_NUMBER = _register("EXPERIENCE_NUMBER", r'experience[^\d]{0,10}(\d+(?:\.\d+)?)')
+
+# Contact details
+EMAIL_NOISE = _register("EMAIL_NOISE", r'[^\w\s@._+-]')
+EMAIL = _register("EMAIL", r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.\w+')
+# Every phone number starts with "+", "(" or a digit; the leading lookahead rejects other
+# positions before the optional country-code group is tried and backtracked
+PHONE = _register("PHONE", r'(?=[+(\d])(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
+
+# Candidate name
+NAME_DISQUALIFIER = _register("NAME_DISQUALIFIER", r'[@\d\.\-]')
+NAME_HEADER_WORDS = _register(
+    "NAME_HEADER_WORDS", r'summary|education|experience|skills|projects|certifications|profile|contact', re.IGNORECASE
+)
+NAME_EDGE_PUNCTUATION = _register("NAME_EDGE_PUNCTUATION", r'^[^\w\s]+|[^\w\s]+$')
+
+# CGPA, applied to lowercased text; both alternatives start with "c", "g" or a digit
+CGPA = _register(
+    "CGPA",
+    r'(?=[cg\d])(?:'
+    r'(?:cgpa|gpa|grade point average)\s*[:\s]*(\d+\.\d+)(?:\s*[\/of]{1,4}\s*(\d+\.\d+|\d+))?'
+    r'|(\d+\.\d+)(?:\s*[\/of]{1,4}\s*(\d+\.\d+|\d+))?\s*(?:cgpa|gpa)'
+    r')'
+)
+
+# Education entry
+EDUCATION_INSTITUTION = _register(
+    "EDUCATION_INSTITUTION",
+    r'([A-Za-z0-9.,()&\-\s]+?(university|college|institute|school)[^–\n]{0,50}[–\-—]?\s*(expected\s*)?\d{4})',
+    re.IGNORECASE
+)
+EDUCATION_DEGREE = _register(
+    "EDUCATION_DEGREE",
+    r'([A-Za-z0-9.,()&\-\s]+?(b\.tech|m\.tech|b\.sc|m\.sc|bca|bba|mba|ph\.d)[^–\n]{0,50}\d{4})',
+    re.IGNORECASE
+)
+
+# Work history
+JOB_BLOCK_SPLIT = _register(
+    "JOB_BLOCK_SPLIT",
+    r'\n(?=[A-Z][a-zA-Z\s,&\.]+(?:\s(?:at|@))?\s*[A-Z][a-zA-Z\s,&\.]*\s*(?:-|\s*' + _MONTH + r'\s+\d{4}))',
+    re.IGNORECASE
+)
+JOB_DATE_RANGE = _register(
+    "JOB_DATE_RANGE",
+    r'(' + _MONTH + r'\s+\d{4}|\d{4})\s*[-–]\s*(present|' + _MONTH + r'\s+\d{4}|\d{4})',
+    re.IGNORECASE
+)
+TITLE_AT_COMPANY = _register("TITLE_AT_COMPANY", r'([A-Z][a-zA-Z\s,\-&.]+)\s+(?:at|@)\s+([A-Z][a-zA-Z\s,\-&.]+)')
+COMPANY_COMMA_TITLE = _register("COMPANY_COMMA_TITLE", r'^([A-Z][a-zA-Z\s,\-&.]+),\s*([A-Z][a-zA-Z\s,\-&.]+)')
+ORGANIZATION_LINE = _register("ORGANIZATION_LINE", r'^[A-Z][a-zA-Z\s,\-&.]+')
+
+# Project details, matched line by line
+ALL_CAPS_LINE = _register("ALL_CAPS_LINE", r'^[A-Z\s]{5,}$')
+BULLET_LINE = _register("BULLET_LINE", r'^[•*-]')
+NUMBERED_LINE = _register("NUMBERED_LINE", r'^[•*-]?\s*\d+[\).:-]?\s')
+URL_LINE = _register("URL_LINE", r'https?://')
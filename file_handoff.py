@@ -0,0 +1,79 @@
+import os
+import threading
+from multiprocessing import shared_memory
+
+# --- Zero-copy handoff of file bytes to worker processes ---
+# Submitting raw file bytes to a ProcessPoolExecutor pickles every resume through the
+# worker pipe (and again for every page task of a fanned-out PDF). Instead the parent copies
+# each pending file once into a named shared memory segment and only a small handle,
+# ("shm", segment_name, size), goes over the pipe; workers attach to the segment by name.
+# Files under SHARED_MEMORY_MIN_BYTES are cheaper to pickle than to map and travel inline
+# as ("inline", bytes).
+
+SHARED_MEMORY_MIN_BYTES = int(os.environ.get("SCREENER_SHM_MIN_BYTES", str(64 * 1024)))
+
+
+class SharedPayloads:
+    """
+    Owns the shared memory segments published for one extraction run. Segments are unlinked
+    by release() as soon as a file's result is in, and any left over when the `with` block
+    exits (e.g. after an error) are unlinked then.
+    """
+
+    def __init__(self, min_bytes=SHARED_MEMORY_MIN_BYTES):
+        self.min_bytes = min_bytes
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    def publish(self, data):
+        """Copies bytes (or any buffer, e.g. an upload's getbuffer()) into shared memory and returns its handle."""
+        size = len(data) if isinstance(data, bytes) else memoryview(data).nbytes
+        if size < self.min_bytes:
+            return ("inline", bytes(data))
+        try:
+            segment = shared_memory.SharedMemory(create=True, size=size)
+        except OSError as e:
+            # e.g. /dev/shm is full or too small inside a container
+            print(f"WARNING: Could not allocate {size} bytes of shared memory ({e}). Sending file inline.")
+            return ("inline", bytes(data))
+        segment.buf[:size] = memoryview(data).cast("B")
+        with self._lock:
+            self._segments[segment.name] = segment
+        return ("shm", segment.name, size)
+
+    def release(self, handle):
+        if handle[0] != "shm":
+            return
+        with self._lock:
+            segment = self._segments.pop(handle[1], None)
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+    def close(self):
+        with self._lock:
+            segments, self._segments = list(self._segments.values()), {}
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+def read_payload(handle):
+    """Worker side: returns the bytes behind a handle from SharedPayloads.publish()."""
+    if handle[0] == "inline":
+        return handle[1]
+    _, name, size = handle
+    # Pool workers share the parent's resource tracker, so attaching here does not hand
+    # ownership of the segment to the worker; the parent still unlinks it.
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        # pdfplumber and poppler need a bytes object, so the worker takes one private copy
+        return bytes(segment.buf[:size])
+    finally:
+        segment.close()
@@ -0,0 +1,158 @@
+import codecs
+import os
+import re
+import zipfile
+from io import BytesIO
+from xml.etree.ElementTree import iterparse
+
+# --- Native extraction for text-based documents ---
+# DOCX, TXT and RTF resumes already contain their text, so they are read directly instead of
+# being converted to PDF and rasterized for OCR. DOCX parts are streamed with iterparse and
+# each paragraph is discarded once its text has been collected, so large documents are
+# never held as a full element tree.
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+NATIVE_EXTENSIONS = {".docx": "docx", ".txt": "txt", ".rtf": "rtf"}
+NATIVE_MIME_TYPES = {DOCX_MIME: "docx", "text/plain": "txt", "application/rtf": "rtf", "text/rtf": "rtf"}
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Headers come first because contact details are often placed in the page header
+_DOCX_PART_PATTERN = re.compile(r'word/(header\d*|document|footer\d*)\.xml$')
+# A DOCX is a zip archive, so cap the uncompressed size of any part we read
+MAX_DOCX_PART_BYTES = 50 * 1024 * 1024
+
+
+def native_document_kind(file_name, file_type):
+    """Returns "docx", "txt" or "rtf" for documents with a native extractor, else None."""
+    kind = NATIVE_EXTENSIONS.get(os.path.splitext(file_name.lower())[1])
+    return kind or NATIVE_MIME_TYPES.get((file_type or "").split(";")[0].strip())
+
+
+def _docx_part_order(part_name):
+    kind = _DOCX_PART_PATTERN.search(part_name).group(1)
+    return (0 if kind.startswith("header") else 1 if kind == "document" else 2, part_name)
+
+
+def _stream_docx_part(stream):
+    """Yields the text of a WordprocessingML part one paragraph at a time."""
+    pieces = []
+    run_depth = 0 # w:tab is a tab character only inside a run; in w:pPr/w:tabs it defines a tab stop
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _W_NS + "r":
+                run_depth += 1
+            continue
+        if tag == _W_NS + "r":
+            run_depth -= 1
+        elif tag == _W_NS + "t":
+            pieces.append(elem.text or "")
+        elif tag == _W_NS + "tab":
+            if run_depth:
+                pieces.append("\t")
+        elif tag in (_W_NS + "br", _W_NS + "cr"):
+            pieces.append("\n")
+        elif tag == _W_NS + "p":
+            yield "".join(pieces)
+            pieces = []
+            elem.clear()
+        elif tag == _W_NS + "tc":
+            elem.clear() # Table cells hold paragraphs that have already been yielded
+    if pieces:
+        yield "".join(pieces)
+
+
+def extract_docx_text(file_bytes):
+    with zipfile.ZipFile(BytesIO(file_bytes)) as zf:
+        parts = sorted((info for info in zf.infolist() if _DOCX_PART_PATTERN.search(info.filename)),
+                       key=lambda info: _docx_part_order(info.filename))
+        if not parts:
+            raise ValueError("Not a Word document (word/document.xml is missing)")
+        paragraphs = []
+        for info in parts:
+            if info.file_size > MAX_DOCX_PART_BYTES:
+                raise ValueError(f"{info.filename} is too large ({info.file_size} bytes uncompressed)")
+            with zf.open(info) as stream:
+                paragraphs.extend(paragraph for paragraph in _stream_docx_part(stream) if paragraph.strip())
+    return "\n".join(paragraphs)
+
+
+def extract_txt_text(file_bytes):
+    if file_bytes.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return file_bytes.decode("utf-16")
+    try:
+        return file_bytes.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return file_bytes.decode("cp1252", errors="replace")
+
+
+# --- RTF ---
+_RTF_TOKEN = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)", re.I | re.S)
+# Destinations whose contents are formatting or metadata rather than document text
+_RTF_SKIP_DESTINATIONS = frozenset([
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "header", "footer",
+    "headerl", "headerr", "headerf", "footerl", "footerr", "footerf", "listtable",
+    "listoverridetable", "rsidtbl", "generator", "themedata", "colorschememapping",
+    "latentstyles", "datastore", "xmlnstbl", "filetbl", "revtbl", "fldinst",
+])
+_RTF_SPECIAL_CHARS = {
+    "par": "\n", "line": "\n", "sect": "\n", "page": "\n", "row": "\n",
+    "tab": "\t", "cell": "\t", "emdash": "\u2014", "endash": "\u2013",
+    "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d", "bullet": "\u2022",
+}
+
+
+def extract_rtf_text(file_bytes):
+    """Strips RTF control words in a single pass over the document."""
+    data = file_bytes.decode("latin-1")
+    stack = []
+    skipping = False
+    unicode_skip = 1 # \ucN: fallback characters that follow each \uN
+    pending_skip = 0
+    out = []
+    for match in _RTF_TOKEN.finditer(data):
+        word, arg, hex_code, symbol, brace, char = match.groups()
+        if match.lastindex is None:
+            continue # Raw line breaks are not part of the text in RTF
+        if brace == "{":
+            stack.append((skipping, unicode_skip))
+        elif brace == "}":
+            if stack:
+                skipping, unicode_skip = stack.pop()
+        elif symbol is not None:
+            if symbol == "*":
+                skipping = True # Unknown "ignorable" destination
+            elif symbol in "\\{}" and not skipping:
+                out.append(symbol)
+            elif symbol == "~" and not skipping:
+                out.append("\u00a0")
+        elif word is not None:
+            word = word.lower()
+            if word in _RTF_SKIP_DESTINATIONS:
+                skipping = True
+            elif word == "uc":
+                unicode_skip = int(arg or 1)
+            elif skipping:
+                continue
+            elif word == "u":
+                code = int(arg or 0)
+                out.append(chr(code + 0x10000 if code < 0 else code))
+                pending_skip = unicode_skip
+            elif word in _RTF_SPECIAL_CHARS:
+                out.append(_RTF_SPECIAL_CHARS[word])
+        elif pending_skip:
+            pending_skip -= 1
+        elif skipping:
+            continue
+        elif hex_code is not None:
+            out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif char is not None:
+            out.append(char)
+    return "".join(out)
+
+
+NATIVE_EXTRACTORS = {"docx": extract_docx_text, "txt": extract_txt_text, "rtf": extract_rtf_text}
+
+
+def extract_native_text(file_bytes, kind):
+    return NATIVE_EXTRACTORS[kind](file_bytes)
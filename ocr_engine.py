@@ -0,0 +1,281 @@
+import os
+import re
+import threading
+from functools import lru_cache
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+# tesserocr wraps the Tesseract C++ API directly: the model is loaded once per process and
+# every page is recognised in memory, instead of forking the `tesseract` binary and writing
+# temp files for every page as pytesseract does. It is optional; without it we fall back
+# to pytesseract.
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# "auto" uses tesserocr when it is installed and falls back to pytesseract otherwise
+OCR_BACKEND = os.environ.get("SCREENER_OCR_BACKEND", "auto")
+OCR_LANG = "eng"
+
+# --- Preprocessing profiles (speed/accuracy trade-off, chosen per deployment) ---
+# target_height:    page height in pixels images are resized to before thresholding
+#                   (an A4 page is ~2340px at 200 DPI), so phone photos are not OCR'd at 4000px.
+# deskew:           estimate and correct small rotations of the page.
+# escalate_below:   mean OCR confidence (0-100) under which a second, higher-quality pass runs.
+# escalate_height:  page height used by that second pass, which also uses adaptive thresholding.
+OCR_PROFILES = {
+    "fast": {"target_height": 1600, "deskew": False, "escalate_below": 0, "escalate_height": 2400},
+    "balanced": {"target_height": 2000, "deskew": True, "escalate_below": 60, "escalate_height": 2800},
+    "accurate": {"target_height": 2800, "deskew": True, "escalate_below": 75, "escalate_height": 3500},
+}
+OCR_PROFILE = os.environ.get("SCREENER_OCR_PROFILE", "balanced")
+
+# Rotations smaller than this are left alone; larger than MAX_DESKEW_ANGLE are assumed to be
+# a misdetection (tables, photos) rather than a skewed scan.
+MIN_DESKEW_ANGLE = 0.5
+MAX_DESKEW_ANGLE = 15.0
+
+
+def _parse_tesseract_config(config):
+    """Pulls the --oem/--psm values out of a tesseract command line config string."""
+    oem = re.search(r'--oem\s+(\d+)', config)
+    psm = re.search(r'--psm\s+(\d+)', config)
+    return (int(oem.group(1)) if oem else None), (int(psm.group(1)) if psm else None)
+
+
+class PytesseractBackend:
+    """Runs the tesseract binary in a subprocess for every image."""
+    name = "pytesseract"
+
+    def __init__(self, lang=OCR_LANG, config=""):
+        self.lang = lang
+        self.config = config
+
+    def image_to_string(self, image):
+        return pytesseract.image_to_string(image, lang=self.lang, config=self.config)
+
+    @staticmethod
+    def signature():
+        """Backend and Tesseract versions, which both change OCR output."""
+        try:
+            tesseract_version = pytesseract.get_tesseract_version()
+        except pytesseract.TesseractNotFoundError:
+            tesseract_version = "missing" # Text-layer PDFs and DOCX files still extract
+        return f"pytesseract-{pytesseract.__version__}/tesseract-{tesseract_version}"
+
+    def recognize(self, image):
+        """Returns (text, mean word confidence 0-100) from a single tesseract run."""
+        data = pytesseract.image_to_data(image, lang=self.lang, config=self.config, output_type=pytesseract.Output.DICT)
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data["text"]):
+            conf = float(data["conf"][i])
+            if conf < 0 or not word.strip():
+                continue
+            confidences.append(conf)
+            line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(line_key, []).append(word)
+        text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+        return text, (sum(confidences) / len(confidences) if confidences else 0.0)
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend:
+    """Keeps one initialised Tesseract API handle alive for the lifetime of the process."""
+    name = "tesserocr"
+
+    def __init__(self, lang=OCR_LANG, config=""):
+        oem, psm = _parse_tesseract_config(config)
+        kwargs = {"lang": lang}
+        if oem is not None:
+            kwargs["oem"] = oem
+        if psm is not None:
+            kwargs["psm"] = psm
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+        # The handle is not thread-safe, and the main Streamlit process can OCR an
+        # uploaded JD from several sessions at once.
+        self._lock = threading.Lock()
+
+    def image_to_string(self, image):
+        with self._lock:
+            self._api.SetImage(image)
+            return self._api.GetUTF8Text()
+
+    @staticmethod
+    def signature():
+        """Backend and Tesseract versions, which both change OCR output."""
+        tesseract_version = tesserocr.tesseract_version().split()[1]
+        return f"tesserocr-{tesserocr.__version__}/tesseract-{tesseract_version}"
+
+    def recognize(self, image):
+        """Returns (text, mean word confidence 0-100) from a single recognition pass."""
+        with self._lock:
+            self._api.SetImage(image)
+            text = self._api.GetUTF8Text()
+            return text, float(self._api.MeanTextConf())
+
+    def close(self):
+        with self._lock:
+            self._api.End()
+
+
+def selected_ocr_backend_class(backend_name=None):
+    """The backend class create_ocr_backend() picks for a name, without creating a backend."""
+    backend_name = backend_name or OCR_BACKEND
+    if backend_name in ("auto", "tesserocr") and tesserocr is not None:
+        return TesserocrBackend
+    return PytesseractBackend
+
+
+def create_ocr_backend(backend_name=None, lang=OCR_LANG, config=""):
+    backend_name = backend_name or OCR_BACKEND
+    if backend_name in ("auto", "tesserocr"):
+        if tesserocr is not None:
+            try:
+                return TesserocrBackend(lang=lang, config=config)
+            except Exception as e:
+                print(f"WARNING: Could not initialise tesserocr ({e}). Falling back to pytesseract.")
+        elif backend_name == "tesserocr":
+            print("WARNING: SCREENER_OCR_BACKEND=tesserocr but tesserocr is not installed. Falling back to pytesseract.")
+    elif backend_name != "pytesseract":
+        print(f"WARNING: Unknown OCR backend '{backend_name}'. Falling back to pytesseract.")
+    return PytesseractBackend(lang=lang, config=config)
+
+
+_process_backend = None
+_process_backend_pid = None
+# Guards lazy creation in the main Streamlit process, where sessions run in threads
+_process_backend_lock = threading.Lock()
+
+
+def init_ocr_worker(backend_name=None, lang=OCR_LANG, config=""):
+    """
+    ProcessPoolExecutor initializer: loads the OCR backend once per worker process, so the
+    traineddata is read at worker start-up rather than for every page.
+    """
+    global _process_backend, _process_backend_pid
+    # A forked worker inherits the parent's handle; it gets a fresh one of its own instead.
+    _process_backend = create_ocr_backend(backend_name, lang=lang, config=config)
+    _process_backend_pid = os.getpid()
+    return _process_backend
+
+
+def get_ocr_backend(config=""):
+    """Returns this process's OCR backend, creating it on first use."""
+    if _process_backend is None or _process_backend_pid != os.getpid():
+        with _process_backend_lock:
+            if _process_backend is None or _process_backend_pid != os.getpid():
+                return init_ocr_worker(config=config)
+    return _process_backend
+
+
+@lru_cache(maxsize=None)
+def ocr_backend_signature(backend_name=None):
+    """
+    Name and version of the OCR backend this deployment uses, e.g. for cache keys. Read from
+    the libraries rather than a live backend, so no Tesseract handle is opened in the parent,
+    and memoized so `tesseract --version` runs once per process.
+    """
+    return selected_ocr_backend_class(backend_name).signature()
+
+
+# --- Preprocessing pipeline ---
+def get_ocr_profile(profile_name=None):
+    profile_name = profile_name or OCR_PROFILE
+    if profile_name not in OCR_PROFILES:
+        print(f"WARNING: Unknown OCR profile '{profile_name}'. Using 'balanced'.")
+        profile_name = "balanced"
+    return OCR_PROFILES[profile_name]
+
+
+def _to_grayscale(image):
+    img_cv = np.array(image)
+    if img_cv.ndim == 3: # Pages rendered in grayscale are already single-channel
+        img_cv = cv2.cvtColor(img_cv, cv2.COLOR_RGB2GRAY)
+    return img_cv
+
+
+def normalize_resolution(gray, target_height):
+    """
+    Scales a page to target_height pixels. Large photos are always shrunk; small images are
+    only enlarged when they are under half the target, where Tesseract starts losing glyphs.
+    """
+    height = gray.shape[0]
+    if height > target_height:
+        interpolation = cv2.INTER_AREA
+    elif height < target_height / 2:
+        interpolation = cv2.INTER_CUBIC
+    else:
+        return gray
+    scale = target_height / height
+    return cv2.resize(gray, (max(1, round(gray.shape[1] * scale)), target_height), interpolation=interpolation)
+
+
+def estimate_skew_angle(gray):
+    """Estimates page rotation in degrees from the bounding box of the ink, on a small copy."""
+    small = normalize_resolution(gray, 800) if gray.shape[0] > 800 else gray
+    _, ink = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    points = cv2.findNonZero(ink)
+    if points is None or len(points) < 100:
+        return 0.0
+    angle = cv2.minAreaRect(points)[-1]
+    # OpenCV versions disagree on the angle range; fold it into (-45, 45]
+    if angle > 45:
+        angle -= 90
+    elif angle <= -45:
+        angle += 90
+    return angle
+
+
+def deskew(gray):
+    angle = estimate_skew_angle(gray)
+    if not MIN_DESKEW_ANGLE <= abs(angle) <= MAX_DESKEW_ANGLE:
+        return gray
+    height, width = gray.shape[:2]
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(gray, rotation, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def preprocess_fast(gray, profile):
+    """First pass: resolution normalisation, optional deskew and a cheap global (Otsu) threshold."""
+    gray = normalize_resolution(gray, profile["target_height"])
+    if profile["deskew"]:
+        gray = deskew(gray)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return Image.fromarray(binary)
+
+
+def preprocess_accurate(gray, profile):
+    """Escalation pass: higher resolution and local adaptive thresholding for uneven lighting."""
+    gray = normalize_resolution(gray, profile["escalate_height"])
+    if profile["deskew"]:
+        gray = deskew(gray)
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    return Image.fromarray(binary)
+
+
+def ocr_image(image, backend=None, profile=None):
+    """
+    Runs the adaptive OCR pipeline on a PIL image. The fast pass runs first; only when its
+    mean confidence is under the profile's escalate_below is the accurate pass run, and the
+    more confident of the two results is kept.
+    Returns (text, confidence, escalated).
+    """
+    backend = backend or get_ocr_backend()
+    profile = profile or get_ocr_profile()
+    gray = _to_grayscale(image)
+
+    text, confidence = backend.recognize(preprocess_fast(gray, profile))
+    if confidence >= profile["escalate_below"]:
+        return text, confidence, False
+
+    accurate_text, accurate_confidence = backend.recognize(preprocess_accurate(gray, profile))
+    if accurate_confidence > confidence:
+        return accurate_text, accurate_confidence, True
+    return text, confidence, True
@@ -0,0 +1,119 @@
+import heapq
+import re
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _is_boundary(text, position):
+    """The r'\b' test: exactly one side of `position` is a word character."""
+    before = position > 0 and _is_word_char(text[position - 1])
+    after = position < len(text) and _is_word_char(text[position])
+    return before != after
+
+# --- Compiled multi-phrase matcher ---
+# Finding a vocabulary of phrases (skills, cities, languages) by looping over it with one
+# regex per phrase costs a full scan of the text per phrase. PhraseMatcher compiles the
+# whole vocabulary once into a single regex shaped like a character trie, so the regex engine
+# walks the text a single time and, at every word boundary, follows the trie to the longest
+# phrase that starts there. Word-boundary semantics match r'\b' + re.escape(phrase) + r'\b'.
+
+
+def _trie_regex(node):
+    """Turns a nested-dict character trie into a regex that prefers the longest branch."""
+    if "" in node and len(node) == 1:
+        return ""
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(node.items()) if char]
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # The phrase may also end here; the greedy ? tries the longer phrases first
+        return "(?:" + body + ")?"
+    return body
+
+
+class PhraseMatcher:
+    def __init__(self, phrases):
+        """
+        phrases: an iterable of phrases, or a dict of phrase -> value reported for its
+        matches. Phrases are matched on their lowercase form, so input text should be
+        lowercased as well.
+        """
+        if not isinstance(phrases, dict):
+            phrases = {phrase: phrase for phrase in phrases}
+        self.values = {}
+        for phrase, value in phrases.items():
+            self.values.setdefault(phrase.lower(), value)
+
+        self._trie = trie = {}
+        for phrase in self.values:
+            if not phrase:
+                continue
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        # A lookahead reports the match at every boundary without consuming the text, so
+        # overlapping candidates are all seen; the outer scan advances one position at a time.
+        self.pattern = re.compile(r"\b(?=(" + _trie_regex(trie) + r")\b)") if trie else None
+
+    def candidates(self, text):
+        """Yields (start, end) of the longest phrase starting at each position of the text."""
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text):
+            yield match.start(), match.end(1)
+
+    def find(self, text):
+        """
+        Returns non-overlapping (start, end, value) matches, resolving overlaps the way a
+        longest-phrase-first search-and-remove loop would: longer matches win, and a phrase
+        cut short by a longer overlapping match falls back to the longest phrase that still
+        fits in front of it. Results are ordered longest first, then by position.
+        """
+        # Heap of (-length, start, end): longest first, then leftmost
+        heap = [(start - end, start, end) for start, end in self.candidates(text)]
+        heapq.heapify(heap)
+        taken = []
+        matches = []
+        while heap:
+            _, start, end = heapq.heappop(heap)
+            conflict = self._first_conflict(taken, start, end)
+            if conflict is not None:
+                if conflict > start:
+                    # Only the tail overlaps a longer match. Re-match with the text cut off
+                    # there, which is what the search sees once the longer match is removed,
+                    # and queue the shorter phrase (if any) by its new length.
+                    fallback = self.pattern.match(text, start, conflict)
+                    if fallback is not None:
+                        heapq.heappush(heap, (start - fallback.end(1), start, fallback.end(1)))
+                continue
+            taken.append((start, end))
+            matches.append((start, end, self.values[text[start:end]]))
+        return matches
+
+    def find_all(self, text):
+        """
+        Returns the set of values of every phrase occurring in the text, including phrases
+        nested in or overlapping longer ones (e.g. both "new delhi" and "delhi").
+        """
+        found = set()
+        for start, _ in self.candidates(text):
+            # The regex reports the longest phrase at each start; walk the trie from there
+            # for the shorter ones that also end on a word boundary.
+            node = self._trie
+            for position in range(start, len(text)):
+                node = node.get(text[position])
+                if node is None:
+                    break
+                if "" in node and _is_boundary(text, position + 1):
+                    found.add(self.values[text[start:position + 1]])
+        return found
+
+    @staticmethod
+    def _first_conflict(taken, start, end):
+        conflict = None
+        for taken_start, taken_end in taken:
+            if taken_start < end and start < taken_end:
+                conflict = taken_start if conflict is None else min(conflict, taken_start)
+        return conflict
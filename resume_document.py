@@ -0,0 +1,55 @@
+import re
+from functools import cached_property
+
+from resume_sections import segment_resume
+
+# --- Resume document ---
+# Every extractor used to derive its own view of the raw text (lowercased, clean_text-ed,
+# split into lines, segmented), so one resume was normalized a dozen times over. A
+# ResumeDocument wraps the raw text and computes each view on first use, then keeps it.
+
+
+def clean_text(text):
+    text = re.sub(r'\n', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+    return text.strip().lower()
+
+
+class ResumeDocument:
+    def __init__(self, text):
+        self.text = text
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def cleaned(self):
+        """Single-line, ASCII-only, lowercased text (see clean_text)."""
+        return clean_text(self.text)
+
+    @cached_property
+    def lines(self):
+        """Lines of the text with leading and trailing blank space stripped first."""
+        return self.text.strip().split('\n')
+
+    @cached_property
+    def tokens(self):
+        """Words of the cleaned text, in order."""
+        return re.findall(r'\b\w+\b', self.cleaned)
+
+    @cached_property
+    def sections(self):
+        return segment_resume(self.text)
+
+    def __str__(self):
+        return self.text
+
+    def __len__(self):
+        return len(self.text)
+
+
+def as_document(text):
+    """Lets extractors take either a ResumeDocument or a raw string."""
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
@@ -0,0 +1,136 @@
+import bisect
+import collections
+import re
+from functools import lru_cache
+
+from extractor_patterns import register_pattern
+
+# --- Resume section index ---
+# Resumes are segmented once into sections by their header lines ("Education", "Work
+# Experience:", "LANGUAGES - English, Hindi", ...), so extractors look their section up
+# instead of each rescanning the full text with their own header regexes.
+
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "experience": ["experience", "work experience", "professional experience", "work history",
+                   "employment history", "employment", "internship", "internships", "internship experience"],
+    "education": ["education", "educational", "academic", "academics", "academic background", "qualification",
+                  "qualifications", "educational qualifications", "academic qualifications"],
+    "projects": ["projects", "project", "personal projects", "key projects", "portfolio", "selected projects",
+                 "major projects", "academic projects", "relevant projects"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "skills summary"],
+    "certifications": ["certifications", "certificates", "licenses & certifications", "licenses and certifications"],
+    "awards": ["awards", "honors", "achievements", "honors & awards", "awards & achievements"],
+    "publications": ["publications"],
+    "interests": ["interests", "hobbies", "hobbies & interests", "extracurricular activities"],
+    "languages": ["languages", "language", "language skills", "linguistic abilities", "known languages",
+                  "language proficiency", "languages spoken", "spoken languages", "foreign languages"],
+}
+HEADER_TO_SECTION = {header: kind for kind, headers in SECTION_HEADERS.items() for header in headers}
+# Header phrases that are only headers on a line of their own: "Project: Payment gateway
+# migration" inside a job entry labels that entry, it does not open a projects section.
+NO_INLINE_HEADERS = {"project"}
+# Words that may follow a header phrase without changing its section ("Education Details",
+# "Educational Qualification", "Projects Undertaken"). A header phrase may also be joined to a
+# second phrase or qualifier by "&", "and", "/" or "," ("EDUCATION AND TRAINING", "Certifications
+# & Courses"); the first phrase decides the section.
+HEADER_QUALIFIERS = ["details", "background", "summary", "history", "overview", "profile", "information",
+                     "record", "highlights", "known", "training", "credentials", "qualification",
+                     "qualifications", "undertaken", "courses", "tools", "technologies", "expertise"]
+
+
+def _phrase_pattern(phrases):
+    return "|".join('[ \t]+'.join(re.escape(word) for word in phrase.split()) for phrase in sorted(phrases, key=len, reverse=True))
+
+
+_HEADER_PHRASE = _phrase_pattern(HEADER_TO_SECTION)
+_HEADER_QUALIFIER = _phrase_pattern(HEADER_QUALIFIERS)
+
+# A header is a line holding only a header phrase and at most two qualifiers, optionally behind
+# a bullet and followed by a separator and inline content ("Languages Known: English, Hindi").
+_HEADER_LINE = register_pattern(
+    "SECTION_HEADER_LINE",
+    r'^[ \t]*[•*#\-]?[ \t]*(?P<header>(?P<phrase>' + _HEADER_PHRASE + r')'
+    + r'(?:[ \t]+(?:' + _HEADER_QUALIFIER + r')'
+    + r'|(?:[ \t]*[&/,][ \t]*|[ \t]+and[ \t]+)(?:' + _HEADER_PHRASE + '|' + _HEADER_QUALIFIER + r')){0,2})'
+    + r'[ \t\r]*(?:$|[:\-–—|][ \t]*(?P<inline>.*)$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# kind:                     section type, a key of SECTION_HEADERS
+# header:                   the header as written (phrase and qualifiers), lowercased
+# header_start/header_end:  character span of the header line in the resume
+# start/end:                character span of the section body (inline header content included)
+# first_line/last_line:     0-based line numbers of the body, last_line exclusive
+# text:                     the body as written; normalized: lowercased, whitespace collapsed
+Section = collections.namedtuple("Section", [
+    "kind", "header", "header_start", "header_end", "start", "end", "first_line", "last_line", "text", "normalized"
+])
+
+
+def _normalize(text):
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+class ResumeSections:
+    def __init__(self, text, sections, line_offsets):
+        self.text = text
+        self.sections = sections
+        self.line_offsets = line_offsets
+        self._by_kind = collections.defaultdict(list)
+        for section in sections:
+            self._by_kind[section.kind].append(section)
+
+    def get(self, kind):
+        """The first section of a kind ("education", "experience", ...), or None."""
+        sections = self._by_kind.get(kind)
+        return sections[0] if sections else None
+
+    def get_all(self, kind):
+        return list(self._by_kind.get(kind, ()))
+
+    def line_number(self, offset):
+        """0-based line number of a character offset in the resume."""
+        return bisect.bisect_right(self.line_offsets, offset) - 1
+
+    def text_without(self, kinds):
+        """The resume with the header and body of every section of the given kinds cut out."""
+        parts = []
+        position = 0
+        for section in self.sections:
+            if section.kind in kinds:
+                parts.append(self.text[position:section.header_start])
+                position = section.end
+        parts.append(self.text[position:])
+        return "".join(parts)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+
+@lru_cache(maxsize=32)
+def segment_resume(text):
+    """
+    Parses a resume once into its typed section map (see Section). Text before the first
+    header is not part of any section. Memoized, so all extractors run on the same resume
+    share one segmentation.
+    """
+    line_offsets = [0] + [match.end() for match in re.finditer(r'\n', text)]
+    headers = [
+        match for match in _HEADER_LINE.finditer(text)
+        if not (match.group("inline") is not None and match.group("header").lower() in NO_INLINE_HEADERS)
+    ]
+    sections = []
+    for i, match in enumerate(headers):
+        header = re.sub(r'\s+', ' ', match.group("header").lower())
+        kind = HEADER_TO_SECTION[re.sub(r'\s+', ' ', match.group("phrase").lower())]
+        start = match.start("inline") if match.group("inline") is not None else match.end()
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        body = text[start:end]
+        first_line = bisect.bisect_right(line_offsets, start) - 1
+        last_line = bisect.bisect_right(line_offsets, max(start, end - 1)) if end > start else first_line
+        sections.append(Section(
+            kind, header, match.start(), match.end(), start, end,
+            first_line, last_line, body, _normalize(body)
+        ))
+    return ResumeSections(text, sections, line_offsets)
@@ -9,10 +9,8 @@ from datetime import datetime, date
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
-from sentence_transformers import SentenceTransformer
 import nltk
 import collections
-from sklearn.metrics.pairwise import cosine_similarity
 import urllib.parse
 import uuid
 import smtplib
@@ -23,8 +21,9 @@ from email import encoders
 import tempfile
 import shutil
 from weasyprint import HTML
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from io import BytesIO
+from types import MappingProxyType
 import traceback
 import time
 import pandas as pd # Ensure pandas is imported
@@ -36,7 +35,26 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 from PIL import Image
 import pytesseract
 import cv2
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+
+from extractor_patterns import (
+    EXPERIENCE_SEPARATORS, YEARS_PHRASE, EXPERIENCE_NUMBER, EMAIL_NOISE, EMAIL, PHONE,
+    NAME_DISQUALIFIER, NAME_HEADER_WORDS, NAME_EDGE_PUNCTUATION, CGPA, EDUCATION_INSTITUTION,
+    EDUCATION_DEGREE, JOB_BLOCK_SPLIT, JOB_DATE_RANGE, TITLE_AT_COMPANY, COMPANY_COMMA_TITLE,
+    ORGANIZATION_LINE, ALL_CAPS_LINE, BULLET_LINE, NUMBERED_LINE, URL_LINE
+)
+from chunked_embeddings import POOLING_MODES, embed_documents_chunked
+from embedding_backends import EMBEDDING_BACKEND, create_embedding_backend, embedding_backend_id
+from embedding_batching import TokenBudgetTuner, encode_token_batched, default_token_budget
+from embedding_store import EmbeddingStore, DEFAULT_STORE_DIR, DEFAULT_MAX_ROWS
+from extraction_cache import ExtractionCache, make_cache_key, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from file_handoff import SharedPayloads, read_payload
+from native_extractors import native_document_kind, extract_native_text
+from phrase_matcher import PhraseMatcher
+from date_ranges import total_experience_months, total_experience_months_batch
+from resume_document import ResumeDocument, as_document, clean_text
+from worker_pool import SupervisedPool, TaskTimeout
+from ocr_engine import get_ocr_backend, init_ocr_worker, ocr_backend_signature, ocr_image, OCR_PROFILE
 
 # Global NLTK download check (should run once)
 try:
@@ -90,6 +108,31 @@ MASTER_CITIES = set([
     "Aventura"
 ])
 
+def load_gazetteer(path):
+    """
+    Reads extra place names for extract_location: one name per line, or a CSV/TSV whose
+    first column is the name (e.g. a GeoNames export). Blank lines and lines starting with
+    "#" are skipped.
+    """
+    place_names = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            name = re.split(r'[\t,]', line, maxsplit=1)[0].strip()
+            if name and not name.startswith("#"):
+                place_names.add(name)
+    return place_names
+
+# Every place extract_location can report, compiled once into a single matcher. Point
+# SCREENER_GAZETTEER_PATH at a larger gazetteer to extend coverage; matching cost per resume
+# depends on the resume's length, not on the number of place names.
+LOCATION_GAZETTEER = set(MASTER_CITIES)
+if os.environ.get("SCREENER_GAZETTEER_PATH"):
+    try:
+        LOCATION_GAZETTEER |= load_gazetteer(os.environ["SCREENER_GAZETTEER_PATH"])
+    except OSError as e:
+        print(f"WARNING: Could not load gazetteer from {os.environ['SCREENER_GAZETTEER_PATH']}: {e}")
+LOCATION_MATCHER = PhraseMatcher(LOCATION_GAZETTEER)
+
 NLTK_STOP_WORDS = set(nltk.corpus.stopwords.words('english'))
 CUSTOM_STOP_WORDS = set([
     "work", "experience", "years", "year", "months", "month", "day", "days", "project", "projects",
@@ -214,10 +257,56 @@ SKILL_CATEGORIES = {
 
 MASTER_SKILLS = set([skill for category_list in SKILL_CATEGORIES.values() for skill in category_list])
 
+# Reverse indexes over SKILL_CATEGORIES, keyed by lowercase skill: the category a skill is
+# reported under (the first one listing it, for skills such as "Jira" that appear twice) and
+# its display casing. Read-only, so every page and worker shares the same mapping.
+SKILL_TO_CATEGORY = MappingProxyType({
+    skill.lower(): category
+    for category, skills_in_category in reversed(list(SKILL_CATEGORIES.items()))
+    for skill in skills_in_category
+})
+SKILL_DISPLAY_NAMES = MappingProxyType({skill.lower(): skill for skill in sorted(MASTER_SKILLS, reverse=True)})
+
+def skill_category(skill):
+    return SKILL_TO_CATEGORY.get(skill.lower(), "Uncategorized")
+
 # IMPORTANT: REPLACE THESE WITH YOUR ACTUAL DEPLOYMENT URLs
 APP_BASE_URL = "https://screenerpro-app.streamlit.app"
 CERTIFICATE_HOSTING_URL = "https://manav-jain.github.io/screenerpro-certs"
 
+# Bump EXTRACTOR_VERSION whenever extract_text_from_file changes its output, so that
+# cached extractions from the previous logic are not reused.
+EXTRACTOR_VERSION = "4"
+# Tesseract configuration for speed and common resume layout
+TESSERACT_CONFIG = "--oem 1 --psm 3"
+# PDF pages with fewer characters than this in their text layer are treated as scanned
+MIN_TEXT_LAYER_CHARS = 50
+# Scanned pages are rendered OCR_PAGE_WINDOW at a time at OCR_DPI, OCR'd and freed before the
+# next window, so peak memory per worker does not grow with document length. Pages past
+# OCR_MAX_PAGES are not OCR'd at all.
+OCR_DPI = int(os.environ.get("SCREENER_OCR_DPI", "200"))
+OCR_MAX_PAGES = int(os.environ.get("SCREENER_OCR_MAX_PAGES", "10"))
+OCR_PAGE_WINDOW = max(1, int(os.environ.get("SCREENER_OCR_PAGE_WINDOW", "1")))
+# Scanned PDFs with at least this many pages to OCR are split into per-page tasks in Phase 1
+OCR_FANOUT_MIN_PAGES = int(os.environ.get("SCREENER_OCR_FANOUT_MIN_PAGES", "3"))
+# Everything besides the file bytes that changes OCR output, used in extraction cache keys
+# together with the OCR backend and its version (see ocr_cache_signature)
+OCR_CACHE_SIGNATURE = f"{TESSERACT_CONFIG}|dpi={OCR_DPI}|max_pages={OCR_MAX_PAGES}|profile={OCR_PROFILE}"
+
+def ocr_cache_signature():
+    # Workers pick their backend by the same rules as this process, so it names theirs too
+    return f"{OCR_CACHE_SIGNATURE}|backend={ocr_backend_signature()}"
+
+# Number of resumes submitted to the process pool at a time, to manage memory and CPU usage
+CHUNK_SIZE = 10
+# Limits for Phase 1 extraction workers (0 disables a limit). A file (or page of a fanned-out
+# PDF) still running after EXTRACTION_TIMEOUT_S, or a worker above EXTRACTION_WORKER_MAX_RSS_MB,
+# gets its worker killed and the file comes back as an [ERROR] result. Workers are replaced
+# with fresh processes after EXTRACTION_WORKER_MAX_TASKS tasks.
+EXTRACTION_TIMEOUT_S = float(os.environ.get("SCREENER_EXTRACTION_TIMEOUT_S", "120"))
+EXTRACTION_WORKER_MAX_RSS_MB = int(os.environ.get("SCREENER_EXTRACTION_WORKER_MAX_RSS_MB", "1536"))
+EXTRACTION_WORKER_MAX_TASKS = int(os.environ.get("SCREENER_EXTRACTION_WORKER_MAX_TASKS", "50"))
+
 
 @st.cache_resource
 def get_tesseract_cmd():
@@ -227,11 +316,33 @@ def get_tesseract_cmd():
         return tesseract_path
     return None
 
+@st.cache_resource
+def get_extraction_cache():
+    cache_dir = os.environ.get("SCREENER_EXTRACTION_CACHE_DIR", DEFAULT_CACHE_DIR)
+    max_mb = os.environ.get("SCREENER_EXTRACTION_CACHE_MB")
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+    return ExtractionCache(cache_dir=cache_dir, max_bytes=max_bytes)
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+# "whole": one embedding of each resume as the model sees it (truncated to its max length).
+# "chunked": resumes are embedded in section-aligned chunks pooled by SCREENER_CHUNK_POOLING
+# ("mean", "max" or "best" chunk against the JD); see chunked_embeddings.
+EMBEDDING_MODE = os.environ.get("SCREENER_EMBEDDING_MODE", "whole")
+if EMBEDDING_MODE not in ("whole", "chunked"):
+    print(f"WARNING: Unknown embedding mode '{EMBEDDING_MODE}'. Using 'whole'.")
+    EMBEDDING_MODE = "whole"
+CHUNK_POOLING = os.environ.get("SCREENER_CHUNK_POOLING", "mean")
+if CHUNK_POOLING not in POOLING_MODES:
+    print(f"WARNING: Unknown chunk pooling '{CHUNK_POOLING}'. Using 'mean'.")
+    CHUNK_POOLING = "mean"
+# The embedding model runs on SCREENER_EMBEDDING_BACKEND: "torch" (default), "onnx" or
+# "onnx-int8" (ONNX Runtime on CPU, needs onnxruntime); see embedding_backends.
+
 # Load ML models once using st.cache_resource
 @st.cache_resource
 def load_ml_model():
     try:
-        model = SentenceTransformer("all-MiniLM-L6-v2")
+        model = create_embedding_backend(EMBEDDING_BACKEND, EMBEDDING_MODEL_NAME)
         ml_model = joblib.load("ml_screening_model.pkl")
         return model, ml_model
     except Exception as e:
@@ -241,62 +352,70 @@ def load_ml_model():
 # Load models globally (once per app run)
 global_sentence_model, global_ml_model = load_ml_model()
 
+@st.cache_resource
+def get_embedding_store(model_id, dim):
+    """Embeddings already computed for a text by this model are read back instead of re-encoded."""
+    store_dir = os.environ.get("SCREENER_EMBEDDING_STORE_DIR", DEFAULT_STORE_DIR)
+    max_rows = int(os.environ.get("SCREENER_EMBEDDING_STORE_MAX_ROWS", str(DEFAULT_MAX_ROWS)))
+    return EmbeddingStore(model_id, dim, store_dir=store_dir, max_rows=max_rows)
+
+def sentence_embedding_store():
+    # Keyed by backend too, so PyTorch and (quantized) ONNX vectors are never mixed
+    model_id = f"{EMBEDDING_MODEL_NAME}@{embedding_backend_id(global_sentence_model)}"
+    return get_embedding_store(model_id, global_sentence_model.get_sentence_embedding_dimension())
+
+@st.cache_resource
+def get_encode_tuner():
+    return TokenBudgetTuner(fixed_budget=default_token_budget())
+
+def encode_texts(texts):
+    """
+    Embeddings of `texts` from the sentence model, through the persistent embedding store;
+    texts that are not stored yet are encoded in token-budget batches.
+    """
+    return sentence_embedding_store().encode(
+        texts, lambda missing: encode_token_batched(global_sentence_model, missing, tuner=get_encode_tuner())
+    )
+
+def embed_resumes(resume_texts, jd_embedding=None):
+    """One embedding per resume, whole or pooled from chunks as set by SCREENER_EMBEDDING_MODE."""
+    if EMBEDDING_MODE == "chunked":
+        return embed_documents_chunked(resume_texts, encode_texts, pooling=CHUNK_POOLING, jd_embedding=jd_embedding)
+    return encode_texts(resume_texts)
 
-def preprocess_image_for_ocr(image):
-    img_cv = np.array(image)
-    img_cv = cv2.cvtColor(img_cv, cv2.COLOR_RGB2GRAY)
-    img_processed = cv2.adaptiveThreshold(img_cv, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                          cv2.THRESH_BINARY, 11, 2)
-    return Image.fromarray(img_processed)
 
-def clean_text(text):
-    text = re.sub(r'\n', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-    return text.strip().lower()
+# Compiled skill matchers keyed by the vocabulary they were built from; the MASTER_SKILLS
+# one is built at import time, so workers forked from this process inherit it.
+_skill_matchers = {}
+
+def get_skill_matcher(filter_set):
+    key = frozenset(filter_set)
+    matcher = _skill_matchers.get(key)
+    if matcher is None:
+        if len(_skill_matchers) >= 16:
+            _skill_matchers.clear()
+        matcher = _skill_matchers[key] = PhraseMatcher(key)
+    return matcher
+
+get_skill_matcher(MASTER_SKILLS)
 
 def extract_relevant_keywords(text, filter_set):
-    cleaned_text = clean_text(text)
+    document = as_document(text)
+    cleaned_text = document.cleaned
     extracted_keywords = set()
     categorized_keywords = collections.defaultdict(list)
 
     if filter_set:
-        sorted_filter_skills = sorted(list(filter_set), key=len, reverse=True)
-        
-        temp_text = cleaned_text
-
-        for skill_phrase in sorted_filter_skills:
-            pattern = r'\b' + re.escape(skill_phrase.lower()) + r'\b'
-            
-            matches = re.findall(pattern, temp_text)
-            if matches:
-                extracted_keywords.add(skill_phrase.lower())
-                found_category = False
-                for category, skills_in_category in SKILL_CATEGORIES.items():
-                    if skill_phrase.lower() in [s.lower() for s in skills_in_category]:
-                        categorized_keywords[category].append(skill_phrase)
-                        found_category = True
-                        break
-                if not found_category:
-                    categorized_keywords["Uncategorized"].append(skill_phrase)
-
-                temp_text = re.sub(pattern, " ", temp_text)
-        
-        individual_words_remaining = set(re.findall(r'\b\w+\b', temp_text))
-        for word in individual_words_remaining:
-            if word in filter_set:
-                extracted_keywords.add(word)
-                found_category = False
-                for category, skills_in_category in SKILL_CATEGORIES.items():
-                    if word.lower() in [s.lower() for s in skills_in_category]:
-                        categorized_keywords[category].append(word)
-                        found_category = True
-                        break
-                if not found_category:
-                    categorized_keywords["Uncategorized"].append(word)
+        # One pass over the text finds every skill; longer skills take precedence over
+        # shorter ones they overlap (e.g. "machine learning" over "learning").
+        for _, _, skill_phrase in get_skill_matcher(filter_set).find(cleaned_text):
+            if skill_phrase.lower() in extracted_keywords:
+                continue
+            extracted_keywords.add(skill_phrase.lower())
+            categorized_keywords[skill_category(skill_phrase)].append(skill_phrase)
 
     else:
-        all_words = set(re.findall(r'\b\w+\b', cleaned_text))
+        all_words = set(document.tokens)
         extracted_keywords = {word for word in all_words if word not in STOP_WORDS}
         for word in extracted_keywords:
             categorized_keywords["General Keywords"].append(word)
@@ -304,58 +423,261 @@ def extract_relevant_keywords(text, filter_set):
     return extracted_keywords, dict(categorized_keywords)
 
 
-def extract_text_from_file(file_bytes, file_name, file_type):
-    full_text = ""
-    # Tesseract configuration for speed and common resume layout
-    tesseract_config = "--oem 1 --psm 3" 
+def _contiguous_page_runs(page_numbers, max_run_length=None):
+    """
+    Groups sorted 1-based page numbers into (first_page, last_page) runs, splitting runs
+    longer than max_run_length.
+    """
+    runs = []
+    for page_number in page_numbers:
+        if runs and page_number == runs[-1][1] + 1 and \
+           (max_run_length is None or runs[-1][1] - runs[-1][0] + 1 < max_run_length):
+            runs[-1][1] = page_number
+        else:
+            runs.append([page_number, page_number])
+    return [tuple(run) for run in runs]
+
+# --- Extraction telemetry ---
+# Every extraction report doubles as a telemetry record: alongside page_sources it carries
+# the file size, page counts, mean OCR confidence and milliseconds spent per sub-step
+# (text_layer, page_count, rasterize, ocr, decode, native), which
+# summarize_extraction_telemetry() aggregates per batch.
+def _new_report(file_bytes):
+    return {"page_sources": [], "bytes": len(file_bytes), "timings_ms": {}, "ocr_confidences": [], "ocr_escalations": 0}
+
+class _timed:
+    """Adds the wall time of a `with` block to report["timings_ms"][step]."""
+    def __init__(self, report, step):
+        self.report = report
+        self.step = step
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        self.report["timings_ms"][self.step] = self.report["timings_ms"].get(self.step, 0.0) + elapsed_ms
+
+def _merge_report_telemetry(report, other):
+    """Folds the timings and OCR confidences of a page task's report into its file's report."""
+    for step, elapsed_ms in other["timings_ms"].items():
+        report["timings_ms"][step] = report["timings_ms"].get(step, 0.0) + elapsed_ms
+    report["ocr_confidences"].extend(other["ocr_confidences"])
+    report["ocr_escalations"] += other["ocr_escalations"]
+
+def _finish_report(report, total_ms=None):
+    """Turns the raw counters of a report into its final telemetry fields."""
+    page_sources = report["page_sources"]
+    confidences = report.pop("ocr_confidences", [])
+    report["page_count"] = None if page_sources == ["native"] else len(page_sources)
+    report["text_layer_pages"] = page_sources.count("text_layer")
+    report["ocr_pages"] = page_sources.count("ocr")
+    report["ocr_confidence"] = round(sum(confidences) / len(confidences), 1) if confidences else None
+    timings = report["timings_ms"]
+    # Fanned-out PDFs ran on several workers, so their total is the sum of work, not wall time
+    timings["total"] = total_ms if total_ms is not None else sum(timings.values())
+    report["timings_ms"] = {step: round(elapsed_ms, 1) for step, elapsed_ms in timings.items()}
+    return report
+
+def summarize_extraction_telemetry(extracted_texts_info, slowest=5):
+    """
+    Aggregates the reports of a Phase 1 batch: per-file latency percentiles (cache hits
+    excluded), the share of pages that needed OCR, time spent per sub-step and the slowest files.
+    """
+    extracted = [(name, report) for name, _, report in extracted_texts_info
+                 if not report.get("cache_hit") and "total" in report.get("timings_ms", {})]
+    totals_ms = [report["timings_ms"]["total"] for _, report in extracted]
+    page_count = sum(report.get("page_count") or 0 for _, _, report in extracted_texts_info)
+    ocr_pages = sum(report.get("ocr_pages", 0) for _, _, report in extracted_texts_info)
+    confidences = [report["ocr_confidence"] for _, report in extracted if report.get("ocr_confidence") is not None]
+    step_totals = collections.Counter()
+    for _, report in extracted:
+        step_totals.update({step: ms for step, ms in report["timings_ms"].items() if step != "total"})
+
+    return {
+        "files": len(extracted_texts_info),
+        "cache_hits": sum(1 for _, _, report in extracted_texts_info if report.get("cache_hit")),
+        "errors": sum(1 for _, text, _ in extracted_texts_info if text.startswith("[ERROR]")),
+        "bytes": sum(report.get("bytes", 0) for _, _, report in extracted_texts_info),
+        "p50_ms": round(float(np.percentile(totals_ms, 50)), 1) if totals_ms else None,
+        "p95_ms": round(float(np.percentile(totals_ms, 95)), 1) if totals_ms else None,
+        "pages": page_count,
+        "ocr_pages": ocr_pages,
+        "ocr_share": round(ocr_pages / page_count, 3) if page_count else 0.0,
+        "mean_ocr_confidence": round(sum(confidences) / len(confidences), 1) if confidences else None,
+        "step_totals_ms": {step: round(ms, 1) for step, ms in step_totals.most_common()},
+        "slowest_files": [
+            {"File Name": name, "Total (ms)": report["timings_ms"]["total"], "Pages": report.get("page_count"),
+             "OCR Pages": report.get("ocr_pages"), "OCR Confidence": report.get("ocr_confidence"), "Bytes": report.get("bytes")}
+            for name, report in sorted(extracted, key=lambda item: item[1]["timings_ms"]["total"], reverse=True)[:slowest]
+        ],
+    }
+
+def _ocr_image(img, report):
+    # Resolution normalisation, deskew and confidence-based escalation live in ocr_engine;
+    # SCREENER_OCR_PROFILE picks the speed/accuracy trade-off.
+    with _timed(report, "ocr"):
+        text, confidence, escalated = ocr_image(img, backend=get_ocr_backend(TESSERACT_CONFIG))
+    report["ocr_confidences"].append(confidence)
+    report["ocr_escalations"] += int(escalated)
+    return text
+
+def _ocr_pdf_pages(file_bytes, page_numbers, report):
+    """
+    OCRs only the given 1-based pages of a PDF, streaming them through memory: at most
+    OCR_PAGE_WINDOW pages are rasterized (in grayscale, at OCR_DPI) at any time, and each
+    window is released before the next one is rendered. Only the first OCR_MAX_PAGES of
+    the requested pages are processed. Returns a dict of page_number -> text.
+    """
+    ocr_texts = {}
+    for first_page, last_page in _contiguous_page_runs(page_numbers[:OCR_MAX_PAGES], OCR_PAGE_WINDOW):
+        with _timed(report, "rasterize"):
+            images = convert_from_bytes(file_bytes, dpi=OCR_DPI, first_page=first_page, last_page=last_page, grayscale=True)
+        for page_number, img in zip(range(first_page, last_page + 1), images):
+            ocr_texts[page_number] = _ocr_image(img, report)
+            img.close()
+        del images
+    return ocr_texts
+
+def _page_needs_ocr(page, page_text):
+    # A page keeps its text layer unless it is (nearly) empty and carries an image,
+    # which is what a scanned or photographed page looks like to pdfplumber.
+    if len(page_text.strip()) >= MIN_TEXT_LAYER_CHARS:
+        return False
+    return bool(page.images) or not page_text.strip()
+
+def _read_pdf_text_layer(file_bytes):
+    """
+    Reads the pdfplumber text layer of every page of a PDF. Returns a list in page order
+    holding the page text, or None for pages that need OCR.
+    """
+    page_texts = []
+    with pdfplumber.open(BytesIO(file_bytes)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ''
+            page_texts.append(None if _page_needs_ocr(page, page_text) else page_text)
+    return page_texts
+
+def _pages_to_ocr(page_texts):
+    """Splits the pages without a text layer into (pages to OCR, pages skipped by OCR_MAX_PAGES)."""
+    ocr_page_numbers = [i + 1 for i, page_text in enumerate(page_texts) if page_text is None]
+    return ocr_page_numbers[:OCR_MAX_PAGES], set(ocr_page_numbers[OCR_MAX_PAGES:])
+
+def _assemble_pdf_text(page_texts, ocr_texts, skipped_ocr_pages):
+    """Joins text-layer and OCR'd pages back together in page order. Returns (text, page_sources)."""
+    full_text_parts = []
+    page_sources = []
+    for page_number, page_text in enumerate(page_texts, start=1):
+        if page_text is not None:
+            page_sources.append("text_layer")
+            full_text_parts.append(page_text)
+        elif page_number in ocr_texts:
+            page_sources.append("ocr")
+            full_text_parts.append(ocr_texts[page_number])
+        elif page_number in skipped_ocr_pages:
+            page_sources.append("ocr_skipped")
+        else:
+            page_sources.append("ocr_failed")
+    return "\n".join(full_text_parts), page_sources
+
+def candidate_name_from_file(file_name):
+    """Fallback candidate name from the file name, e.g. "john_doe.docx" -> "John Doe"."""
+    return os.path.splitext(os.path.basename(file_name))[0].replace('_', ' ').title()
 
-    if "pdf" in file_type:
+def _check_extracted_text(full_text, file_name):
+    if not full_text.strip():
+        print(f"ERROR: No readable text extracted from {file_name}. It might be a very low-quality scan or an empty document.")
+        return "[ERROR] No readable text extracted from the file. It might be a very low-quality scan or an empty document."
+    return full_text
+
+def _extract_pdf_text(file_bytes, file_name, page_texts, report):
+    """OCRs the pages of an already-read PDF text layer that need it and assembles the document."""
+    ocr_page_numbers, skipped_ocr_pages = _pages_to_ocr(page_texts)
+    ocr_texts = {}
+    if ocr_page_numbers:
         try:
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                pdf_text = ''.join(page.extract_text() or '' for page in pdf.pages)
-            
-            if len(pdf_text.strip()) < 50: # Heuristic for potentially scanned PDF
-                images = convert_from_bytes(file_bytes)
-                for img in images:
-                    processed_img = preprocess_image_for_ocr(img)
-                    full_text += pytesseract.image_to_string(processed_img, lang='eng', config=tesseract_config) + "\n"
-            else:
-                full_text = pdf_text
+            ocr_texts = _ocr_pdf_pages(file_bytes, ocr_page_numbers, report)
+        except Exception as e_ocr:
+            # Keep whatever the text layer gave us; only fail if there is nothing at all
+            print(f"ERROR: OCR failed for pages {ocr_page_numbers} of {file_name}: {str(e_ocr)}")
+            if len(ocr_page_numbers) == len(page_texts):
+                return f"[ERROR] Failed to extract text from PDF via OCR: {str(e_ocr)}"
+
+    full_text, report["page_sources"] = _assemble_pdf_text(page_texts, ocr_texts, skipped_ocr_pages)
+    return _check_extracted_text(full_text, file_name)
+
+def extract_text_with_report(file_bytes, file_name, file_type):
+    """
+    Extracts text from a PDF, image, DOCX, TXT or RTF resume and reports how it was obtained.
+    Returns (text, report) where report["page_sources"] lists, per page, whether the
+    text came from the PDF "text_layer", from "ocr", was skipped because of OCR_MAX_PAGES
+    ("ocr_skipped"), or whether OCR failed ("ocr_failed"). DOCX/TXT/RTF documents are read
+    natively, never OCR'd, and report a single "native" entry.
+    The report is also the file's telemetry record: bytes, page_count, text_layer_pages,
+    ocr_pages, ocr_confidence (mean, 0-100), ocr_escalations and timings_ms per sub-step.
+    On failure, text is an "[ERROR] ..." string.
+    """
+    report = _new_report(file_bytes)
+    start = time.perf_counter()
+    text = _extract_text_into_report(file_bytes, file_name, file_type, report)
+    return text, _finish_report(report, (time.perf_counter() - start) * 1000)
 
+def _extract_text_into_report(file_bytes, file_name, file_type, report):
+    native_kind = native_document_kind(file_name, file_type)
+
+    if native_kind:
+        try:
+            with _timed(report, "native"):
+                full_text = extract_native_text(file_bytes, native_kind)
+            report["page_sources"] = ["native"]
+        except Exception as e:
+            print(f"ERROR: Failed to extract text from {native_kind.upper()} for {file_name}: {str(e)}")
+            return f"[ERROR] Failed to extract text from {native_kind.upper()} file: {str(e)}"
+
+    elif "pdf" in file_type:
+        try:
+            with _timed(report, "text_layer"):
+                page_texts = _read_pdf_text_layer(file_bytes)
         except Exception as e:
             # Fallback to OCR directly if pdfplumber fails or for any other PDF error
             try:
-                images = convert_from_bytes(file_bytes)
-                for img in images:
-                    processed_img = preprocess_image_for_ocr(img)
-                    full_text += pytesseract.image_to_string(processed_img, lang='eng', config=tesseract_config) + "\n"
+                with _timed(report, "page_count"):
+                    page_count = pdfinfo_from_bytes(file_bytes)["Pages"]
+                ocr_texts = _ocr_pdf_pages(file_bytes, list(range(1, page_count + 1)), report)
+                report["page_sources"] = ["ocr" if page_number in ocr_texts else "ocr_skipped" for page_number in range(1, page_count + 1)]
+                full_text = "\n".join(ocr_texts[page_number] for page_number in sorted(ocr_texts))
             except Exception as e_ocr:
                 print(f"ERROR: Failed to extract text from PDF via OCR for {file_name}: {str(e_ocr)}")
                 return f"[ERROR] Failed to extract text from PDF via OCR: {str(e_ocr)}"
+        else:
+            return _extract_pdf_text(file_bytes, file_name, page_texts, report)
 
     elif "image" in file_type:
         try:
-            img = Image.open(BytesIO(file_bytes)).convert("RGB")
-            processed_img = preprocess_image_for_ocr(img)
-            full_text = pytesseract.image_to_string(processed_img, lang='eng', config=tesseract_config)
+            with _timed(report, "decode"):
+                img = Image.open(BytesIO(file_bytes)).convert("RGB")
+            full_text = _ocr_image(img, report)
+            report["page_sources"] = ["ocr"]
         except Exception as e:
             print(f"ERROR: Failed to extract text from image for {file_name}: {str(e)}")
             return f"[ERROR] Failed to extract text from image: {str(e)}"
     else:
         print(f"ERROR: Unsupported file type for {file_name}: {file_type}")
-        return f"[ERROR] Unsupported file type: {file_type}. Please upload a PDF or an image (JPG, PNG)."
+        return f"[ERROR] Unsupported file type: {file_type}. Please upload a PDF, DOCX, TXT, RTF or an image (JPG, PNG)."
 
-    if not full_text.strip():
-        print(f"ERROR: No readable text extracted from {file_name}. It might be a very low-quality scan or an empty document.")
-        return "[ERROR] No readable text extracted from the file. It might be a very low-quality scan or an empty document."
-    
-    return full_text
+    return _check_extracted_text(full_text, file_name)
+
+def extract_text_from_file(file_bytes, file_name, file_type):
+    text, _ = extract_text_with_report(file_bytes, file_name, file_type)
+    return text
 
 
 
-def extract_years_of_experience(resume_text):
-    def remove_education_section(text):
-        lines = text.lower().splitlines()
+def _experience_text(resume_text):
+    """Lowercased resume text with education removed and date separators normalized."""
+    def remove_education_section(text_lower):
+        # Keyword heuristic for resumes without an education header
+        lines = text_lower.splitlines()
         filtered = []
         inside_education = False
         for line in lines:
@@ -370,89 +692,55 @@ def extract_years_of_experience(resume_text):
                 filtered.append(line)
         return "\n".join(filtered)
 
-    def normalize_date_str(date_str):
-        return re.sub(r'[,\.\s]+', ' ', date_str.strip().lower()).title()
-
-    text = remove_education_section(resume_text)
-    text = re.sub(r'[\:\,\–—]+', ' - ', text)  # Normalize all symbols to hyphen
-
-    total_months = 0
-    now = datetime.now()
-
-    date_patterns = [
-        r'(\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{4})\s*[-to]+\s*(present|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{4})',
-        r'(\b\d{4})\s*[-to]+\s*(present|\b\d{4})'
-    ]
-
-    for pattern in date_patterns:
-        job_date_ranges = re.findall(pattern, text)
-        for start_str, end_str in job_date_ranges:
-            start_str = normalize_date_str(start_str)
-            end_str = normalize_date_str(end_str)
-
-            # Parse start date
-            try:
-                start_date = datetime.strptime(start_str, '%B %Y')
-            except:
-                try:
-                    start_date = datetime.strptime(start_str, '%b %Y')
-                except:
-                    try:
-                        start_date = datetime(int(start_str.strip()), 1, 1)
-                    except:
-                        continue
-
-            if not start_date or start_date > now:
-                continue
-
-            # Parse end date
-            if 'present' in end_str.lower():
-                end_date = now
-            else:
-                try:
-                    end_date = datetime.strptime(end_str, '%B %Y')
-                except:
-                    try:
-                        end_date = datetime.strptime(end_str, '%b %Y')
-                    except:
-                        try:
-                            end_date = datetime(int(end_str.strip()), 12, 31)
-                        except:
-                            continue
-
-                if end_date > now:
-                    end_date = now
-
-            if not end_date:
-                continue
-
-            delta_months = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
-            total_months += max(delta_months, 0)
+    # Education dates (graduation years, "2018 - 2022") are not work experience
+    document = as_document(resume_text)
+    if document.sections.get("education"):
+        text = document.sections.text_without({"education"}).lower()
+    else:
+        text = remove_education_section(document.lower)
+    return EXPERIENCE_SEPARATORS.sub(' - ', text)  # Normalize all symbols to hyphen
 
+def _years_from_experience_text(text, total_months):
     if total_months > 0:
         return round(total_months / 12, 1)
 
     # Fallback: textual pattern like "3 years of experience"
-    match = re.search(r'(\d+(?:\.\d+)?)\s*(\+)?\s*(year|yrs|years)\b', text)
+    match = YEARS_PHRASE.search(text)
     if not match:
-        match = re.search(r'experience[^\d]{0,10}(\d+(?:\.\d+)?)', text)
+        match = EXPERIENCE_NUMBER.search(text)
     if match:
         return float(match.group(1))
 
     return 0.0
 
+def extract_years_of_experience(resume_text, now=None):
+    # Overlapping or concurrent roles are counted once (see date_ranges)
+    text = _experience_text(resume_text)
+    return _years_from_experience_text(text, total_experience_months(text, now))
+
+def extract_years_of_experience_batch(resume_texts, now=None):
+    """extract_years_of_experience() for many resumes, measured against one `now`."""
+    texts = [_experience_text(resume_text) for resume_text in resume_texts]
+    months = total_experience_months_batch(texts, now)
+    return [_years_from_experience_text(text, total) for text, total in zip(texts, months)]
+
+# Common OCR misreadings of email domains, fixed in this order before matching
+EMAIL_TYPO_FIXES = [
+    ("gmaill.com", "gmail.com"), ("gmai.com", "gmail.com"), ("yah00", "yahoo"),
+    ("outiook", "outlook"), ("coim", "com"), ("hotmai", "hotmail"),
+]
 
 def extract_email(text):
-    text = text.lower()
+    text = as_document(text).lower
 
-    text = text.replace("gmaill.com", "gmail.com").replace("gmai.com", "gmail.com")
-    text = text.replace("yah00", "yahoo").replace("outiook", "outlook")
-    text = text.replace("coim", "com").replace("hotmai", "hotmail")
+    for typo, fix in EMAIL_TYPO_FIXES:
+        text = text.replace(typo, fix)
 
-    text = re.sub(r'[^\w\s@._+-]', ' ', text)
+    text = EMAIL_NOISE.sub(' ', text)
 
-    possible_emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.\w+', text)
+    return _pick_email(EMAIL.findall(text))
 
+def _pick_email(possible_emails):
     if possible_emails:
         for email in possible_emails:
             if "gmail" in email or "manav" in email: # Specific filter, consider removing or making configurable
@@ -462,26 +750,22 @@ def extract_email(text):
     return None
 
 def extract_phone_number(text):
-    match = re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', text)
+    match = PHONE.search(as_document(text).text)
     return match.group(0) if match else None
 
 def extract_location(text):
-    found_locations = set()
-    text_lower = text.lower()
-
-    sorted_cities = sorted(list(MASTER_CITIES), key=len, reverse=True)
-
-    for city in sorted_cities:
-        pattern = r'\b' + re.escape(city.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_locations.add(city)
+    # Every gazetteer entry in the text is reported, including ones nested in a longer name
+    found_locations = LOCATION_MATCHER.find_all(as_document(text).lower)
 
     if found_locations:
         return ", ".join(sorted(list(found_locations)))
     return "Not Found"
 
 def extract_name(text):
-    lines = text.strip().split('\n')
+    return _name_from_lines(as_document(text).lines)
+
+def _name_from_lines(lines):
+    """Picks the candidate's name from the first lines of a resume (only the first 5 are read)."""
     if not lines:
         return None
 
@@ -492,7 +776,7 @@ def extract_name(text):
         line = line.strip()
         line_lower = line.lower()
 
-        if not re.search(r'[@\d\.\-]', line) and \
+        if not NAME_DISQUALIFIER.search(line) and \
            len(line.split()) <= 4 and \
            not any(term in line_lower for term in EXCLUDE_NAME_TERMS):
             if line.isupper() or (line and line[0].isupper() and all(word[0].isupper() or not word.isalpha() for word in line.split())):
@@ -500,17 +784,17 @@ def extract_name(text):
 
     if potential_name_lines:
         name = max(potential_name_lines, key=len)
-        name = re.sub(r'summary|education|experience|skills|projects|certifications|profile|contact', '', name, flags=re.IGNORECASE).strip()
-        name = re.sub(r'^[^\w\s]+|[^\w\s]+$', '', name).strip()
+        name = NAME_HEADER_WORDS.sub('', name).strip()
+        name = NAME_EDGE_PUNCTUATION.sub('', name).strip()
         if name:
             return name.title()
     return None
 
 def extract_cgpa(text):
-    text = text.lower()
-    
-    matches = re.findall(r'(?:cgpa|gpa|grade point average)\s*[:\s]*(\d+\.\d+)(?:\s*[\/of]{1,4}\s*(\d+\.\d+|\d+))?|(\d+\.\d+)(?:\s*[\/of]{1,4}\s*(\d+\.\d+|\d+))?\s*(?:cgpa|gpa)', text)
+    return _cgpa_from_matches(CGPA.findall(as_document(text).lower))
 
+def _cgpa_from_matches(matches):
+    """The first CGPA match, normalized to a 4.0 scale."""
     for match in matches:
         if match[0] and match[0].strip():
             raw_cgpa = float(match[0])
@@ -531,6 +815,77 @@ def extract_cgpa(text):
         
     return None
 
+# --- Batch extraction of cheap fields ---
+# Email, phone, name and CGPA need only a few regex passes over each resume, so for a batch
+# they are extracted column by column with pandas string methods instead of one Python call
+# per resume per field. The values are the same as the per-resume extractors return.
+CHEAP_FIELDS = ["email", "phone", "name", "cgpa"]
+
+def extract_cheap_fields_batch(resume_texts):
+    """
+    resume_texts: a list or pandas Series of resume texts (or ResumeDocuments).
+    Returns a DataFrame with CHEAP_FIELDS columns and one row per resume, aligned with the
+    Series index; fields that were not found are None.
+    """
+    if not isinstance(resume_texts, pd.Series):
+        resume_texts = pd.Series(list(resume_texts), dtype=object)
+    texts = resume_texts.map(str) # ResumeDocument -> text
+    lowered = texts.str.lower()
+    fields = pd.DataFrame(index=texts.index, columns=CHEAP_FIELDS, dtype=object)
+
+    # Substring tests over the whole column are cheap, so the regexes only run on the rows
+    # that can match: an email needs an "@", a CGPA needs "gpa" or "grade point average".
+    has_email = lowered.str.contains("@", regex=False)
+    email_text = lowered[has_email]
+    for typo, fix in EMAIL_TYPO_FIXES:
+        email_text = email_text.str.replace(typo, fix, regex=False)
+    email_text = email_text.str.replace(EMAIL_NOISE, ' ', regex=True)
+    fields.loc[has_email, "email"] = email_text.str.findall(EMAIL).map(_pick_email)
+
+    fields["phone"] = texts.map(extract_phone_number)
+    fields["name"] = texts.str.strip().str.split('\n', n=5).map(_name_from_lines)
+
+    has_cgpa = lowered.str.contains("gpa", regex=False) | lowered.str.contains("grade point average", regex=False)
+    fields.loc[has_cgpa, "cgpa"] = lowered[has_cgpa].str.findall(CGPA).map(_cgpa_from_matches)
+    return fields.astype(object).where(fields.notna(), None)
+
+# Tag thresholds, best first: (tag, min score, min years, min semantic similarity, min CGPA).
+# A years minimum also caps experience at the run's maximum; a missing CGPA never disqualifies.
+TAG_RULES = [
+    ("👑 Exceptional Match", 90, 5, 0.85, 3.5),
+    ("🔥 Strong Candidate", 80, 3, 0.7, 3.0),
+    ("✨ Promising Fit", 60, 1, None, 2.5),
+    ("⚠️ Needs Review", 40, None, None, None),
+]
+DEFAULT_TAG = "❌ Limited Match"
+
+def candidate_tag(score, years_exp, semantic_similarity, cgpa, max_experience):
+    for tag, min_score, min_years, min_similarity, min_cgpa in TAG_RULES:
+        if score >= min_score and \
+           (min_years is None or min_years <= years_exp <= max_experience) and \
+           (min_similarity is None or semantic_similarity >= min_similarity) and \
+           (min_cgpa is None or cgpa is None or cgpa >= min_cgpa):
+            return tag
+    return DEFAULT_TAG
+
+def candidate_tags(scores, years_exp, semantic_similarity, cgpa, max_experience):
+    """candidate_tag() over whole columns at once; returns an array of tags."""
+    scores = np.asarray(scores, dtype=float)
+    years_exp = np.asarray(years_exp, dtype=float)
+    semantic_similarity = np.asarray(semantic_similarity, dtype=float)
+    cgpa = pd.to_numeric(pd.Series(list(cgpa), dtype=object), errors="coerce").to_numpy(dtype=float)
+    conditions = []
+    for _, min_score, min_years, min_similarity, min_cgpa in TAG_RULES:
+        condition = scores >= min_score
+        if min_years is not None:
+            condition &= (years_exp >= min_years) & (years_exp <= max_experience)
+        if min_similarity is not None:
+            condition &= semantic_similarity >= min_similarity
+        if min_cgpa is not None:
+            condition &= np.isnan(cgpa) | (cgpa >= min_cgpa)
+        conditions.append(condition)
+    return np.select(conditions, [rule[0] for rule in TAG_RULES], default=DEFAULT_TAG)
+
 def extract_education_text(text):
     """
     Extracts a single-line education entry from resume text.
@@ -538,39 +893,19 @@ def extract_education_text(text):
     Works with or without 'Expected' in the year.
     """
 
-    text = text.replace('\r', '').replace('\t', ' ')
-    lines = text.split('\n')
-    lines = [line.strip() for line in lines if line.strip()]
-
-    education_section = ''
-    capture = False
-
-    for line in lines:
-        line_lower = line.lower()
-        if any(h in line_lower for h in ['education', 'academic background', 'qualifications']):
-            capture = True
-            continue
-        if capture and any(h in line_lower for h in ['experience', 'skills', 'certifications', 'projects', 'languages']):
-            break
-        if capture:
-            education_section += line + ' '
+    section = as_document(text).sections.get("education")
+    if not section:
+        return None
 
-    education_section = education_section.strip()
+    section_text = section.text.replace('\r', '').replace('\t', ' ')
+    education_section = ' '.join(line.strip() for line in section_text.split('\n') if line.strip())
 
-    edu_match = re.search(
-        r'([A-Za-z0-9.,()&\-\s]+?(university|college|institute|school)[^–\n]{0,50}[–\-—]?\s*(expected\s*)?\d{4})',
-        education_section,
-        re.IGNORECASE
-    )
+    edu_match = EDUCATION_INSTITUTION.search(education_section)
 
     if edu_match:
         return edu_match.group(1).strip()
 
-    fallback_match = re.search(
-        r'([A-Za-z0-9.,()&\-\s]+?(b\.tech|m\.tech|b\.sc|m\.sc|bca|bba|mba|ph\.d)[^–\n]{0,50}\d{4})',
-        education_section,
-        re.IGNORECASE
-    )
+    fallback_match = EDUCATION_DEGREE.search(education_section)
     if fallback_match:
         return fallback_match.group(1).strip()
 
@@ -578,26 +913,13 @@ def extract_education_text(text):
     return fallback_line if fallback_line else None
 
 def extract_work_history(text):
-    work_history_section_matches = re.finditer(r'(?:experience|work history|employment history)\s*(\n|$)', text, re.IGNORECASE)
+    section = as_document(text).sections.get("experience")
     work_details = []
-    
-    start_index = -1
-    for match in work_history_section_matches:
-        start_index = match.end()
-        break
-
-    if start_index != -1:
-        sections = ['education', 'skills', 'projects', 'certifications', 'awards', 'publications']
-        end_index = len(text)
-        for section in sections:
-            section_match = re.search(r'\b' + re.escape(section) + r'\b', text[start_index:], re.IGNORECASE)
-            if section_match:
-                end_index = start_index + section_match.start()
-                break
-        
-        work_text = text[start_index:end_index].strip()
+
+    if section:
+        work_text = section.text.strip()
         
-        job_blocks = re.split(r'\n(?=[A-Z][a-zA-Z\s,&\.]+(?:\s(?:at|@))?\s*[A-Z][a-zA-Z\s,&\.]*\s*(?:-|\s*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{4}))', work_text, flags=re.IGNORECASE)
+        job_blocks = JOB_BLOCK_SPLIT.split(work_text)
         
         for block in job_blocks:
             block = block.strip()
@@ -609,10 +931,7 @@ def extract_work_history(text):
             start_date = None
             end_date = None
 
-            date_range_match = re.search(
-                r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{4}|\d{4})\s*[-–]\s*(present|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{4}|\d{4})',
-                block, re.IGNORECASE
-            )
+            date_range_match = JOB_DATE_RANGE.search(block)
             if date_range_match:
                 start_date = date_range_match.group(1)
                 end_date = date_range_match.group(2)
@@ -623,20 +942,20 @@ def extract_work_history(text):
                 line = line.strip()
                 if not line: continue
 
-                title_company_match = re.search(r'([A-Z][a-zA-Z\s,\-&.]+)\s+(?:at|@)\s+([A-Z][a-zA-Z\s,\-&.]+)', line)
+                title_company_match = TITLE_AT_COMPANY.search(line)
                 if title_company_match:
                     title = title_company_match.group(1).strip()
                     company = title_company_match.group(2).strip()
                     break
                 
-                company_title_match = re.search(r'^([A-Z][a-zA-Z\s,\-&.]+),\s*([A-Z][a-zA-Z\s,\-&.]+)', line)
+                company_title_match = COMPANY_COMMA_TITLE.search(line)
                 if company_title_match:
                     company = company_title_match.group(1).strip()
                     title = company_title_match.group(2).strip()
                     break
                 
                 if not company and not title:
-                    potential_org_match = re.search(r'^[A-Z][a-zA-Z\s,\-&.]+', line)
+                    potential_org_match = ORGANIZATION_LINE.search(line)
                     if potential_org_match and len(potential_org_match.group(0).split()) > 1:
                         if not company: company = potential_org_match.group(0).strip()
                         elif not title: title = potential_org_match.group(0).strip()
@@ -658,28 +977,15 @@ def extract_project_details(text, MASTER_SKILLS):
     """
 
     project_details = []
-
-    text = text.replace('\r', '').replace('\t', ' ')
-    lines = text.split('\n')
-    lines = [line.strip() for line in lines if line.strip()]
+    document = as_document(text)
 
     # Step 1: Isolate project section
-    project_section_keywords = r'(projects|personal projects|key projects|portfolio|selected projects|major projects|academic projects|relevant projects)'
-    project_section_match = re.search(project_section_keywords + r'\s*(\n|$)', text, re.IGNORECASE)
-
-    if not project_section_match:
-        project_text = text[:1000]  # fallback to first 1000 chars
-        start_index = 0
+    section = document.sections.get("projects")
+    if not section:
+        project_text = document.text[:1000]  # fallback to first 1000 chars
     else:
-        start_index = project_section_match.end()
-        sections = ['education', 'experience', 'skills', 'certifications', 'awards', 'publications', 'interests', 'hobbies']
-        end_index = len(text)
-        for section in sections:
-            match = re.search(r'\b' + re.escape(section) + r'\b', text[start_index:], re.IGNORECASE)
-            if match:
-                end_index = start_index + match.start()
-                break
-        project_text = text[start_index:end_index].strip()
+        project_text = section.text.strip()
+    project_text = project_text.replace('\r', '').replace('\t', ' ')
 
     if not project_text:
         return []
@@ -696,12 +1002,12 @@ def extract_project_details(text, MASTER_SKILLS):
         line_lower = line.lower()
 
         # Skip all-uppercase names or headers
-        if re.match(r'^[A-Z\s]{5,}$', line) and len(line.split()) <= 4:
+        if ALL_CAPS_LINE.match(line) and len(line.split()) <= 4:
             continue
 
         # Previous line was a bullet?
         prev_line_is_bullet = False
-        if i > 0 and re.match(r'^[•*-]', lines[i - 1]):
+        if i > 0 and BULLET_LINE.match(lines[i - 1]):
             prev_line_is_bullet = True
 
         # Strong new project title if:
@@ -710,26 +1016,26 @@ def extract_project_details(text, MASTER_SKILLS):
         # - contains 3–15 words
         # - not all caps
         is_title = (
-            (re.match(r'^[•*-]?\s*\d+[\).:-]?\s', line) or line.lower().startswith("project")) and
+            (NUMBERED_LINE.match(line) or line.lower().startswith("project")) and
             3 <= len(line.split()) <= 15 and
             not any(kw in line_lower for kw in forbidden_title_keywords) and
             not prev_line_is_bullet and
             not line.isupper()
         )
 
-        is_url = re.match(r'https?://', line_lower)
+        is_url = URL_LINE.match(line_lower)
 
         # New Project Begins
         if is_title or is_url:
             if current_project["Project Title"] or current_project["Description"]:
                 full_desc = "\n".join(current_project["Description"])
                 techs, _ = extract_relevant_keywords(full_desc, MASTER_SKILLS)
-                current_project["Technologies Used"].update(techs)
+                current_project["Technologies Used"].update(SKILL_DISPLAY_NAMES.get(tech, tech) for tech in techs)
 
                 project_details.append({
                     "Project Title": current_project["Project Title"],
                     "Description": full_desc.strip(),
-                    "Technologies Used": ", ".join(sorted(current_project["Technologies Used"]))
+                    "Technologies Used": ", ".join(sorted(current_project["Technologies Used"], key=str.lower))
                 })
 
             current_project = {"Project Title": line, "Description": [], "Technologies Used": set()}
@@ -740,79 +1046,52 @@ def extract_project_details(text, MASTER_SKILLS):
     if current_project["Project Title"] or current_project["Description"]:
         full_desc = "\n".join(current_project["Description"])
         techs, _ = extract_relevant_keywords(full_desc, MASTER_SKILLS)
-        current_project["Technologies Used"].update(techs)
+        current_project["Technologies Used"].update(SKILL_DISPLAY_NAMES.get(tech, tech) for tech in techs)
 
         project_details.append({
             "Project Title": current_project["Project Title"],
             "Description": full_desc.strip(),
-            "Technologies Used": ", ".join(sorted(current_project["Technologies Used"]))
+            "Technologies Used": ", ".join(sorted(current_project["Technologies Used"], key=str.lower))
         })
 
     return project_details
 
 
+# Known languages, compiled once into a single matcher that reports display names
+LANGUAGE_NAMES = frozenset([
+    "english", "hindi", "spanish", "french", "german", "mandarin", "japanese", "arabic",
+    "russian", "portuguese", "italian", "korean", "bengali", "marathi", "telugu", "tamil",
+    "gujarati", "urdu", "kannada", "odia", "malayalam", "punjabi", "assamese", "kashmiri",
+    "sindhi", "sanskrit", "dutch", "swedish", "norwegian", "danish", "finnish", "greek",
+    "turkish", "hebrew", "thai", "vietnamese", "indonesian", "malay", "filipino", "swahili",
+    "farsi", "persian", "polish", "ukrainian", "romanian", "czech", "slovak", "hungarian",
+    "chinese", "tagalog", "nepali", "sinhala", "burmese", "khmer", "lao", "pashto", "dari",
+    "uzbek", "kazakh", "azerbaijani", "georgian", "armenian", "albanian", "serbian",
+    "croatian", "bosnian", "bulgarian", "macedonian", "slovenian", "estonian", "latvian",
+    "lithuanian", "icelandic", "irish", "welsh", "gaelic", "maltese", "esperanto", "latin",
+    "ancient greek", "modern greek", "yiddish", "romani", "catalan", "galician", "basque",
+    "breton", "cornish", "manx", "frisian", "luxembourgish", "sami", "romansh", "sardinian",
+    "corsican", "occitan", "provencal", "walloon", "flemish", "afrikaans", "zulu", "xhosa",
+    "sesotho", "setswana", "shona", "ndebele", "venda", "tsonga", "swati", "kikuyu",
+    "luganda", "kinyarwanda", "kirundi", "lingala", "kongo", "yoruba", "igbo", "hausa",
+    "fulani", "twi", "ewe", "ga", "dagbani", "gur", "mossi", "bambara", "senufo", "wolof",
+    "mandinka", "susu", "krio", "temne", "limba", "mende", "gola", "vai", "kpelle", "loma",
+    "bandi", "bassa", "grebo", "krahn", "dan", "mano", "guerze", "kono", "kisi"
+])
+LANGUAGE_MATCHER = PhraseMatcher({language: language.title() for language in LANGUAGE_NAMES})
+
 def extract_languages(text):
     """
     Extracts known languages from resume text.
     Returns a comma-separated string of detected languages or 'Not Found'.
     """
-    languages_list = set()
-    cleaned_full_text = clean_text(text)
-
-    # De-duplicated, lowercase language set
-    all_languages = list(set([
-        "english", "hindi", "spanish", "french", "german", "mandarin", "japanese", "arabic",
-        "russian", "portuguese", "italian", "korean", "bengali", "marathi", "telugu", "tamil",
-        "gujarati", "urdu", "kannada", "odia", "malayalam", "punjabi", "assamese", "kashmiri",
-        "sindhi", "sanskrit", "dutch", "swedish", "norwegian", "danish", "finnish", "greek",
-        "turkish", "hebrew", "thai", "vietnamese", "indonesian", "malay", "filipino", "swahili",
-        "farsi", "persian", "polish", "ukrainian", "romanian", "czech", "slovak", "hungarian",
-        "chinese", "tagalog", "nepali", "sinhala", "burmese", "khmer", "lao", "pashto", "dari",
-        "uzbek", "kazakh", "azerbaijani", "georgian", "armenian", "albanian", "serbian",
-        "croatian", "bosnian", "bulgarian", "macedonian", "slovenian", "estonian", "latvian",
-        "lithuanian", "icelandic", "irish", "welsh", "gaelic", "maltese", "esperanto", "latin",
-        "ancient greek", "modern greek", "yiddish", "romani", "catalan", "galician", "basque",
-        "breton", "cornish", "manx", "frisian", "luxembourgish", "sami", "romansh", "sardinian",
-        "corsican", "occitan", "provencal", "walloon", "flemish", "afrikaans", "zulu", "xhosa",
-        "sesotho", "setswana", "shona", "ndebele", "venda", "tsonga", "swati", "kikuyu",
-        "luganda", "kinyarwanda", "kirundi", "lingala", "kongo", "yoruba", "igbo", "hausa",
-        "fulani", "twi", "ewe", "ga", "dagbani", "gur", "mossi", "bambara", "senufo", "wolof",
-        "mandinka", "susu", "krio", "temne", "limba", "mende", "gola", "vai", "kpelle", "loma",
-        "bandi", "bassa", "grebo", "krahn", "dan", "mano", "guerze", "kono", "kisi"
-    ]))
-
-    sorted_all_languages = sorted(all_languages, key=len, reverse=True)
-
-    # Step 1: Try to locate a language-specific section
-    section_match = re.search(
-        r'\b(languages|language skills|linguistic abilities|known languages)\s*[:\-]?\s*\n?',
-        cleaned_full_text, re.IGNORECASE
-    )
+    # Step 1: Use the resume's language section if it has one
+    document = as_document(text)
+    section = document.sections.get("languages")
+    language_chunk = clean_text(section.text) if section else document.cleaned
 
-    if section_match:
-        start_index = section_match.end()
-        # Optional: stop at next known section
-        stop_words = ['education', 'experience', 'skills', 'certifications', 'awards', 'publications', 'interests', 'hobbies']
-        end_index = len(cleaned_full_text)
-        for stop in stop_words:
-            m = re.search(r'\b' + stop + r'\b', cleaned_full_text[start_index:], re.IGNORECASE)
-            if m:
-                end_index = start_index + m.start()
-                break
-
-        language_chunk = cleaned_full_text[start_index:end_index]
-    else:
-        language_chunk = cleaned_full_text
-
-    # Step 2: Match known languages
-    for lang in sorted_all_languages:
-        # Use word boundaries for exact matches and allow for common suffixes like " (fluent)"
-        pattern = r'\b' + re.escape(lang) + r'(?:\s*\(?[a-z\s,-]+\)?)?\b'
-        if re.search(pattern, language_chunk, re.IGNORECASE):
-            if lang == "de":
-                languages_list.add("German")
-            else:
-                languages_list.add(lang.title())
+    # Step 2: Match known languages as whole words in a single pass
+    languages_list = LANGUAGE_MATCHER.find_all(language_chunk)
 
     return ", ".join(sorted(languages_list)) if languages_list else "Not Found"
 
@@ -982,64 +1261,78 @@ def generate_detailed_hr_assessment(candidate_name, score, years_exp, semantic_s
 
     return final_assessment
 
-# Modified semantic_score to accept pre-computed embeddings
-# Removed @st.cache_data as it will be called differently
-def semantic_score_calculation(jd_embedding, resume_embedding, years_exp, cgpa, weighted_keyword_overlap_score, _ml_model):
-    score = 0.0
-    semantic_similarity = cosine_similarity(jd_embedding.reshape(1, -1), resume_embedding.reshape(1, -1))[0][0]
-    semantic_similarity = float(np.clip(semantic_similarity, 0, 1))
+# Certificate ranks by minimum score, best first
+CERTIFICATE_RANK_RULES = [
+    ("🏅 Elite Match", 90),
+    ("⭐ Strong Match", 80),
+    ("✅ Good Fit", 75),
+]
+NO_CERTIFICATE_RANK = "Not Applicable"
+
+def certificate_ranks(scores):
+    """Certificate rank of every score at once; returns an array of ranks."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [scores >= min_score for _, min_score in CERTIFICATE_RANK_RULES],
+        [rank for rank, _ in CERTIFICATE_RANK_RULES], default=NO_CERTIFICATE_RANK
+    )
+
+def _basic_scores(weighted_keyword_overlap_scores, years_exp, cgpa):
+    """Fallback score without the ML model: keyword overlap, experience and CGPA only."""
+    scores = weighted_keyword_overlap_scores * 0.7 + np.minimum(years_exp * 5, 30)
+    scores += np.select([cgpa >= 3.5, cgpa < 2.5], [5, -5], default=0)
+    return np.round(np.minimum(scores, 100), 2)
+
+def score_resumes_batch(jd_embedding, resume_embeddings, years_exp, cgpa, weighted_keyword_overlap_scores, _ml_model):
+    """
+    Scores a batch of resumes against one JD: the cosine similarities are one matrix-vector
+    product, the ML model is called once on the N x (2 * dim + 2) feature matrix, and the
+    blend and CGPA adjustments are array operations. A missing CGPA (None) adjusts nothing.
+    Returns (scores, semantic similarities) as arrays rounded to 2 decimals.
+    """
+    jd_embedding = np.asarray(jd_embedding, dtype=np.float32).ravel()
+    resume_embeddings = np.asarray(resume_embeddings, dtype=np.float32).reshape(-1, jd_embedding.size)
+    years_exp = np.array([0.0 if years is None else years for years in years_exp], dtype=float)
+    cgpa = pd.to_numeric(pd.Series(list(cgpa), dtype=object), errors="coerce").to_numpy(dtype=float)
+    overlap = np.asarray(weighted_keyword_overlap_scores, dtype=float)
+    count = len(resume_embeddings)
+    if count == 0:
+        return np.empty(0), np.empty(0)
+
+    # Unit-normalize both sides first (as sklearn does), so scores match the per-resume path
+    resume_norms = np.linalg.norm(resume_embeddings, axis=1, keepdims=True)
+    jd_norm = np.linalg.norm(jd_embedding) or 1.0
+    unit_resumes = resume_embeddings / np.where(resume_norms == 0, 1.0, resume_norms)
+    semantic_similarity = np.clip((unit_resumes @ (jd_embedding / jd_norm)).astype(float), 0, 1)
 
     if _ml_model is None:
-        print("DEBUG: ML model not loaded in semantic_score_calculation. Providing basic score and generic feedback.")
-        basic_score = (weighted_keyword_overlap_score * 0.7)
-        basic_score += min(years_exp * 5, 30)
-        
-        if cgpa is not None:
-            if cgpa >= 3.5:
-                basic_score += 5
-            elif cgpa < 2.5:
-                basic_score -= 5
-        
-        score = round(min(basic_score, 100), 2)
-        
-        return score, round(semantic_similarity, 2)
+        print("DEBUG: ML model not loaded in score_resumes_batch. Providing basic scores.")
+        return _basic_scores(overlap, years_exp, cgpa), np.round(semantic_similarity, 2)
 
     try:
-        years_exp_for_model = float(years_exp) if years_exp is not None else 0.0
-        features = np.concatenate([jd_embedding, resume_embedding, [years_exp_for_model], [weighted_keyword_overlap_score]])
-        predicted_score = _ml_model.predict([features])[0]
+        features = np.hstack([
+            np.broadcast_to(jd_embedding, (count, jd_embedding.size)), resume_embeddings,
+            years_exp[:, None], overlap[:, None]
+        ])
+        predicted_scores = np.asarray(_ml_model.predict(features), dtype=float)
 
-        blended_score = (predicted_score * 0.6) + \
-                        (weighted_keyword_overlap_score * 0.1) + \
-                        (semantic_similarity * 100 * 0.3)
+        blended_scores = (predicted_scores * 0.6) + (overlap * 0.1) + (semantic_similarity * 100 * 0.3)
+        blended_scores += np.where((semantic_similarity > 0.7) & (years_exp >= 3), 5, 0)
+        blended_scores += np.select([cgpa >= 3.5, cgpa >= 3.0, cgpa < 2.5], [3, 1, -2], default=0)
 
-        if semantic_similarity > 0.7 and years_exp >= 3:
-            blended_score += 5
-        
-        if cgpa is not None:
-            if cgpa >= 3.5:
-                blended_score += 3
-            elif cgpa >= 3.0:
-                blended_score += 1
-            elif cgpa < 2.5:
-                blended_score -= 2
-
-        score = float(np.clip(blended_score, 0, 100))
-        
-        return round(score, 2), round(semantic_similarity, 2)
+        return np.round(np.clip(blended_scores, 0, 100), 2), np.round(semantic_similarity, 2)
 
     except Exception as e:
-        print(f"ERROR: Error during semantic score calculation: {e}")
+        print(f"ERROR: Error during batch score calculation: {e}")
         traceback.print_exc()
-        basic_score = (weighted_keyword_overlap_score * 0.7)
-        basic_score += min(years_exp * 5, 30)
-        
-        if cgpa is not None:
-            basic_score += 5 if cgpa >= 3.5 else (-5 if cgpa < 2.5 else 0)
-
-        score = round(min(basic_score, 100), 2)
+        return _basic_scores(overlap, years_exp, cgpa), np.zeros(count)
 
-        return score, 0.0
+def semantic_score_calculation(jd_embedding, resume_embedding, years_exp, cgpa, weighted_keyword_overlap_score, _ml_model):
+    """Score and semantic similarity of a single resume; see score_resumes_batch()."""
+    scores, semantic_similarity = score_resumes_batch(
+        jd_embedding, [resume_embedding], [years_exp], [cgpa], [weighted_keyword_overlap_score], _ml_model
+    )
+    return float(scores[0]), float(semantic_similarity[0])
 
 def create_mailto_link(recipient_email, candidate_name, job_title="Job Opportunity", sender_name="Recruiting Team"):
     subject = urllib.parse.quote(f"Invitation for Interview - {job_title} - {candidate_name}")
@@ -1134,26 +1427,208 @@ Have questions? Contact us at support@screenerpro.in
     return False
 
 # Wrapper for extract_text_from_file to be used with ProcessPoolExecutor
-def _extract_text_wrapper(file_info):
-    file_data_bytes, file_name, file_type = file_info
-    text = extract_text_from_file(file_data_bytes, file_name, file_type)
-    return file_name, text
-
-# Modified _process_single_resume_for_screener_page
-def _process_single_resume_for_screener_page(file_name, text, jd_text, jd_embedding, 
-                                             resume_embedding, jd_name_for_results,
-                                             high_priority_skills, medium_priority_skills, max_experience,
-                                             _global_ml_model):
+def _extract_text_wrapper(file_info, allow_page_fanout=False):
+    """
+    Extracts one file inside a worker. With allow_page_fanout, a PDF with at least
+    OCR_FANOUT_MIN_PAGES scanned pages is not OCR'd here: the worker returns text=None and
+    the text layer in report["page_texts"], so the parent can spread the OCR pages across
+    the pool.
+    """
+    payload_handle, file_name, file_type = file_info
+    file_data_bytes = read_payload(payload_handle)
+    if allow_page_fanout and "pdf" in file_type:
+        report = _new_report(file_data_bytes)
+        start = time.perf_counter()
+        try:
+            with _timed(report, "text_layer"):
+                page_texts = _read_pdf_text_layer(file_data_bytes)
+        except Exception:
+            pass # extract_text_with_report takes the OCR fallback path for unreadable PDFs
+        else:
+            ocr_page_numbers, _ = _pages_to_ocr(page_texts)
+            if len(ocr_page_numbers) >= OCR_FANOUT_MIN_PAGES:
+                report["page_texts"] = page_texts
+                return file_name, None, report
+            text = _extract_pdf_text(file_data_bytes, file_name, page_texts, report)
+            return file_name, text, _finish_report(report, (time.perf_counter() - start) * 1000)
+
+    text, report = extract_text_with_report(file_data_bytes, file_name, file_type)
+    return file_name, text, report
+
+# Wrapper for OCR'ing a single page of a fanned-out PDF in the worker pool. The page's
+# timings and OCR confidence come back in a partial report that the parent merges.
+def _ocr_pdf_page_wrapper(payload_handle, page_number):
+    file_data_bytes = read_payload(payload_handle)
+    report = _new_report(file_data_bytes)
+    return page_number, _ocr_pdf_pages(file_data_bytes, [page_number], report)[page_number], report
+
+def extract_texts_concurrently(file_infos, on_progress=None, total=None):
+    """
+    Phase 1 of a screening run: turns (file_bytes, file_name, file_type) tuples into
+    (file_name, text, report) tuples, where report is the per-page breakdown from
+    extract_text_with_report. The extraction cache is consulted first, so only files that
+    have never been extracted before are dispatched to a SupervisedPool, which enforces
+    the per-file deadline and per-worker memory ceiling above.
+    Long scanned PDFs are split into one OCR task per page, scheduled on the same pool as
+    the whole-file tasks and reassembled in page order, so a single long scan does not
+    hold up the batch.
+    File bytes reach the workers through shared memory (see file_handoff), so file_bytes
+    may be any buffer, e.g. an upload's getbuffer(), and file_infos may be a generator
+    (pass `total` then): each file is only held by the caller until it has been hashed
+    and published.
+    `on_progress(done, total)` is called after every file.
+    """
+    with SharedPayloads() as payloads:
+        return _extract_texts_concurrently(file_infos, payloads, on_progress, total)
+
+def _is_cacheable(text, report):
+    """
+    Only complete extractions are cached. Text with pages whose OCR failed, timed out or
+    was killed for memory is still returned to the run, but a later run tries those pages again.
+    """
+    return not text.startswith("[ERROR]") and "ocr_failed" not in report.get("page_sources", [])
+
+def _extract_texts_concurrently(file_infos, payloads, on_progress, total):
+    cache = get_extraction_cache()
+    total = len(file_infos) if total is None else total
+    extracted_texts_info = []
+
+    # Group cache misses by key so the same resume uploaded twice is only extracted once.
+    # Pending entries hold a shared memory handle rather than the bytes themselves.
+    pending = collections.OrderedDict()
+    ocr_signature = ocr_cache_signature()
+    for file_data_bytes, file_name, file_type in file_infos:
+        cache_key = make_cache_key(file_data_bytes, EXTRACTOR_VERSION, ocr_signature)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            extracted_texts_info.append((file_name, cached["text"], dict(cached["report"], cache_hit=True)))
+            if on_progress:
+                on_progress(len(extracted_texts_info), total)
+        elif cache_key in pending:
+            pending[cache_key][1].append(file_name)
+        else:
+            pending[cache_key] = ((payloads.publish(file_data_bytes), file_name, file_type), [file_name])
+        del file_data_bytes
+
+    def _record_result(cache_key, text, report):
+        payloads.release(pending[cache_key][0][0])
+        if _is_cacheable(text, report):
+            cache.put(cache_key, {"text": text, "report": report})
+        for name in pending[cache_key][1]:
+            extracted_texts_info.append((name, text, report))
+            if on_progress:
+                on_progress(len(extracted_texts_info), total)
+
+    if pending:
+        max_workers = os.cpu_count() or 1
+        allow_page_fanout = max_workers > 1
+        queued_files = collections.deque(pending.keys())
+        fanned_out = {} # cache_key -> {"page_texts", "ocr_texts", "report", "skipped", "remaining"}
+        in_flight = {}
+
+        # Each worker loads its OCR engine once up front instead of once per page
+        with SupervisedPool(max_workers=max_workers, initializer=init_ocr_worker, initargs=(None, "eng", TESSERACT_CONFIG),
+                            task_timeout=EXTRACTION_TIMEOUT_S, max_rss_bytes=EXTRACTION_WORKER_MAX_RSS_MB * 1024 * 1024,
+                            max_tasks_per_worker=EXTRACTION_WORKER_MAX_TASKS) as executor:
+            while queued_files or in_flight:
+                # Keep at most CHUNK_SIZE whole files in flight; page tasks are not limited
+                # because they only exist for files that are already in flight.
+                while queued_files and sum(1 for task in in_flight.values() if task[0] == "file") < CHUNK_SIZE:
+                    cache_key = queued_files.popleft()
+                    future = executor.submit(_extract_text_wrapper, pending[cache_key][0], allow_page_fanout)
+                    in_flight[future] = ("file", cache_key, None)
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_kind, cache_key, page_number = in_flight.pop(future)
+                    payload_handle, file_name, _ = pending[cache_key][0]
+
+                    if task_kind == "page":
+                        state = fanned_out[cache_key]
+                        try:
+                            _, state["ocr_texts"][page_number], page_report = future.result()
+                            _merge_report_telemetry(state["report"], page_report)
+                        except Exception as e:
+                            print(f"ERROR: OCR failed for page {page_number} of {file_name}: {e}")
+                        state["remaining"] -= 1
+                        if state["remaining"] == 0:
+                            report = state["report"]
+                            full_text, report["page_sources"] = _assemble_pdf_text(state["page_texts"], state["ocr_texts"], state["skipped"])
+                            del fanned_out[cache_key]
+                            _record_result(cache_key, _check_extracted_text(full_text, file_name), _finish_report(report))
+                        continue
+
+                    try:
+                        _, text, report = future.result()
+                    except TaskTimeout:
+                        print(f"ERROR: Text extraction for {file_name} timed out; its worker was replaced.")
+                        text, report = f"[ERROR] Text extraction timed out after {EXTRACTION_TIMEOUT_S:g} seconds", {"page_sources": []}
+                    except Exception as e:
+                        st.error(f"Error extracting text for {file_name}: {e}")
+                        text, report = f"[ERROR] {e}", {"page_sources": []} # Mark as error
+
+                    if text is None:
+                        ocr_page_numbers, skipped_ocr_pages = _pages_to_ocr(report["page_texts"])
+                        fanned_out[cache_key] = {
+                            "page_texts": report.pop("page_texts"), "ocr_texts": {}, "report": report,
+                            "skipped": skipped_ocr_pages, "remaining": len(ocr_page_numbers)
+                        }
+                        for ocr_page_number in ocr_page_numbers:
+                            page_future = executor.submit(_ocr_pdf_page_wrapper, payload_handle, ocr_page_number)
+                            in_flight[page_future] = ("page", cache_key, ocr_page_number)
+                        continue
+
+                    _record_result(cache_key, text, report)
+
+        print(f"Extraction workers: {dict(executor.stats)}")
+    print(f"Extraction cache: {cache.stats()}")
+    return extracted_texts_info
+
+# --- Job description profile ---
+# The JD side of the analysis (its skills, their priority weights and its embedding) is the
+# same for every resume in a run, so it is computed once and shared by all of them.
+JD_SKILL_WEIGHT_HIGH = 3
+JD_SKILL_WEIGHT_MEDIUM = 2
+JD_SKILL_WEIGHT_BASE = 1
+
+JDProfile = collections.namedtuple("JDProfile", ["skills", "categorized_skills", "skill_weights", "embedding"])
+
+def build_jd_profile(jd_text, high_priority_skills=(), medium_priority_skills=(), embedding=None):
+    jd_skills, jd_categorized_skills = extract_relevant_keywords(jd_text, MASTER_SKILLS)
+    high = {skill.lower() for skill in high_priority_skills}
+    medium = {skill.lower() for skill in medium_priority_skills}
+    skill_weights = {
+        skill: JD_SKILL_WEIGHT_HIGH if skill in high else JD_SKILL_WEIGHT_MEDIUM if skill in medium else JD_SKILL_WEIGHT_BASE
+        for skill in jd_skills
+    }
+    return JDProfile(frozenset(jd_skills), jd_categorized_skills, skill_weights, embedding)
+
+def weighted_keyword_overlap(jd_profile, resume_skills):
+    return sum(weight for skill, weight in jd_profile.skill_weights.items() if skill in resume_skills)
+
+# The run's JD profile, installed once per analysis worker process
+_analysis_worker_state = {}
+
+def _init_analysis_worker(jd_profile, jd_name_for_results):
+    _analysis_worker_state.update(jd_profile=jd_profile, jd_name_for_results=jd_name_for_results)
+
+def _analyze_resume_in_worker(file_name, text, cheap_fields=None):
+    state = _analysis_worker_state
+    return analyze_resume(file_name, text, state["jd_profile"], state["jd_name_for_results"], cheap_fields)
+
+def analyze_resume(file_name, text, jd_profile, jd_name_for_results, cheap_fields=None):
     """
-    Processes a single resume (pre-extracted text and pre-computed embeddings)
-    for the main screener page and returns a dictionary of results.
-    This function is designed to be run in a ProcessPoolExecutor.
+    Extracts everything about one resume that does not depend on its score (fields, skills,
+    JD keyword matches) and returns its result row, to be scored in a batch with the other
+    resumes by score_analyzed_resumes(). Unreadable resumes get a finished error row.
+    This function is designed to be run in a ProcessPoolExecutor; scoring is not done here
+    but once for the whole batch in score_analyzed_resumes(), in the parent process.
     """
     try:
         if text.startswith("[ERROR]"):
             return {
                 "File Name": file_name,
-                "Candidate Name": file_name.replace('.pdf', '').replace('.jpg', '').replace('.jpeg', '').replace('.png', '').replace('_', ' ').title(),
+                "Candidate Name": candidate_name_from_file(file_name),
                 "Score (%)": 0, "Years Experience": 0, "CGPA (4.0 Scale)": None,
                 "Email": "Not Found", "Phone Number": "Not Found", "Location": "Not Found",
                 "Languages": "Not Found", "Education Details": "Not Found",
@@ -1168,99 +1643,44 @@ def _process_single_resume_for_screener_page(file_name, text, jd_text, jd_embedd
                 "Tag": "❌ Text Extraction Error"
             }
 
-        exp = extract_years_of_experience(text)
-        email = extract_email(text)
-        phone = extract_phone_number(text)
-        location = extract_location(text)
-        languages = extract_languages(text) 
+        # Every extractor below shares this document's lowercased/cleaned/sectioned views
+        document = ResumeDocument(text)
+
+        exp = extract_years_of_experience(document)
+        # Cheap fields come precomputed from extract_cheap_fields_batch() when run as a batch
+        if cheap_fields is None:
+            cheap_fields = {
+                "email": extract_email(document), "phone": extract_phone_number(document),
+                "name": extract_name(document), "cgpa": extract_cgpa(document),
+            }
+        email = cheap_fields["email"]
+        phone = cheap_fields["phone"]
+        location = extract_location(document)
+        languages = extract_languages(document) 
         
-        education_details_text = extract_education_text(text)
-        work_history_raw = extract_work_history(text)
-        project_details_raw = extract_project_details(text, MASTER_SKILLS)
+        education_details_text = extract_education_text(document)
+        work_history_raw = extract_work_history(document)
+        project_details_raw = extract_project_details(document, MASTER_SKILLS)
         
         education_details_formatted = education_details_text
         work_history_formatted = format_work_history(work_history_raw)
         project_details_formatted = format_project_details(project_details_raw)
 
-        candidate_name = extract_name(text) or file_name.replace('.pdf', '').replace('.jpg', '').replace('.jpeg', '').replace('.png', '').replace('_', ' ').title()
-        cgpa = extract_cgpa(text)
-
-        resume_raw_skills_set, resume_categorized_skills = extract_relevant_keywords(text, MASTER_SKILLS)
-        jd_raw_skills_set, jd_categorized_skills = extract_relevant_keywords(jd_text, MASTER_SKILLS)
-
-        matched_keywords = list(resume_raw_skills_set.intersection(jd_raw_skills_set))
-        missing_skills = list(jd_raw_skills_set.difference(resume_raw_skills_set)) 
-
-        # Calculate weighted keyword overlap score
-        weighted_keyword_overlap_score = 0
-        total_jd_skill_weight = 0
-        WEIGHT_HIGH = 3
-        WEIGHT_MEDIUM = 2
-        WEIGHT_BASE = 1
-
-        for jd_skill in jd_raw_skills_set:
-            current_weight = WEIGHT_BASE
-            if jd_skill in [s.lower() for s in high_priority_skills]:
-                current_weight = WEIGHT_HIGH
-            elif jd_skill in [s.lower() for s in medium_priority_skills]:
-                current_weight = WEIGHT_MEDIUM
-            
-            total_jd_skill_weight += current_weight
-            
-            if jd_skill in resume_raw_skills_set:
-                weighted_keyword_overlap_score += current_weight
-
-        # Call the semantic score calculation with pre-computed embeddings
-        score, semantic_similarity = semantic_score_calculation(
-            jd_embedding, resume_embedding, exp, cgpa, weighted_keyword_overlap_score, _global_ml_model
-        )
-        
-        concise_ai_suggestion = generate_concise_ai_suggestion(
-            candidate_name=candidate_name,
-            score=score,
-            years_exp=exp,
-            semantic_similarity=semantic_similarity,
-            cgpa=cgpa
-        )
+        candidate_name = cheap_fields["name"] or candidate_name_from_file(file_name)
+        cgpa = cheap_fields["cgpa"]
 
-        detailed_hr_assessment = generate_detailed_hr_assessment(
-            candidate_name=candidate_name,
-            score=score,
-            years_exp=exp,
-            semantic_similarity=semantic_similarity,
-            cgpa=cgpa,
-            jd_text=jd_text,
-            resume_text=text,
-            matched_keywords=matched_keywords,
-            missing_skills=missing_skills,
-            max_exp_cutoff=max_experience
-        )
+        resume_raw_skills_set, resume_categorized_skills = extract_relevant_keywords(document, MASTER_SKILLS)
+        jd_categorized_skills = jd_profile.categorized_skills
 
-        certificate_id = str(uuid.uuid4())
-        certificate_rank = "Not Applicable"
+        matched_keywords = list(resume_raw_skills_set.intersection(jd_profile.skills))
+        missing_skills = list(jd_profile.skills.difference(resume_raw_skills_set))
 
-        if score >= 90:
-            certificate_rank = "🏅 Elite Match"
-        elif score >= 80:
-            certificate_rank = "⭐ Strong Match"
-        elif score >= 75:
-            certificate_rank = "✅ Good Fit"
-        
-        # Determine Tag
-        tag = "❌ Limited Match"
-        if score >= 90 and exp >= 5 and exp <= max_experience and semantic_similarity >= 0.85 and (cgpa is None or cgpa >= 3.5):
-            tag = "👑 Exceptional Match"
-        elif score >= 80 and exp >= 3 and exp <= max_experience and semantic_similarity >= 0.7 and (cgpa is None or cgpa >= 3.0):
-            tag = "🔥 Strong Candidate"
-        elif score >= 60 and exp >= 1 and exp <= max_experience and (cgpa is None or cgpa >= 2.5):
-            tag = "✨ Promising Fit"
-        elif score >= 40:
-            tag = "⚠️ Needs Review"
+        weighted_keyword_overlap_score = weighted_keyword_overlap(jd_profile, resume_raw_skills_set)
 
         return {
             "File Name": file_name,
             "Candidate Name": candidate_name,
-            "Score (%)": score,
+            "Score (%)": None, # Score-dependent fields are filled in by score_analyzed_resumes()
             "Years Experience": exp,
             "CGPA (4.0 Scale)": cgpa,
             "Email": email or "Not Found",
@@ -1270,26 +1690,27 @@ def _process_single_resume_for_screener_page(file_name, text, jd_text, jd_embedd
             "Education Details": education_details_formatted,
             "Work History": work_history_formatted,
             "Project Details": project_details_formatted,
-            "AI Suggestion": concise_ai_suggestion,
-            "Detailed HR Assessment": detailed_hr_assessment,
+            "AI Suggestion": None,
+            "Detailed HR Assessment": None,
             "Matched Keywords": ", ".join(matched_keywords),
             "Missing Skills": ", ".join(missing_skills),
             "Matched Keywords (Categorized)": dict(resume_categorized_skills),
             "Missing Skills (Categorized)": dict(jd_categorized_skills),
-            "Semantic Similarity": semantic_similarity,
+            "Semantic Similarity": None,
             "Resume Raw Text": text,
             "JD Used": jd_name_for_results,
             "Date Screened": datetime.now().date(),
             "Certificate ID": str(uuid.uuid4()),
-            "Certificate Rank": certificate_rank,
-            "Tag": tag
+            "Certificate Rank": None,
+            "Tag": None,
+            "_keyword_overlap": weighted_keyword_overlap_score
         }
     except Exception as e:
         print(f"CRITICAL ERROR: Unhandled exception processing {file_name}: {e}")
         traceback.print_exc()
         return {
             "File Name": file_name,
-            "Candidate Name": file_name.replace('.pdf', '').replace('.jpg', '').replace('.jpeg', '').replace('.png', '').replace('_', ' ').title(),
+            "Candidate Name": candidate_name_from_file(file_name),
             "Score (%)": 0, "Years Experience": 0, "CGPA (4.0 Scale)": None,
             "Email": "Not Found", "Phone Number": "Not Found", "Location": "Not Found",
             "Languages": "Not Found", "Education Details": "Not Found",
@@ -1305,6 +1726,51 @@ def _process_single_resume_for_screener_page(file_name, text, jd_text, jd_embedd
         }
 
 
+def score_analyzed_resumes(rows, resume_embeddings, jd_embedding, max_experience, _ml_model):
+    """
+    Scores rows from analyze_resume() (in the order of resume_embeddings) in one batch and
+    fills in what depends on the score: AI suggestion, HR assessment, certificate rank and
+    tag. Rows are updated in place and returned.
+    """
+    if not rows:
+        return rows
+    years_exp = [row["Years Experience"] for row in rows]
+    cgpa = [row["CGPA (4.0 Scale)"] for row in rows]
+    scores, semantic_similarity = score_resumes_batch(
+        jd_embedding, resume_embeddings, years_exp, cgpa,
+        [row.pop("_keyword_overlap") for row in rows], _ml_model
+    )
+    ranks = certificate_ranks(scores)
+    tags = candidate_tags(scores, years_exp, semantic_similarity, cgpa, max_experience)
+
+    for row, score, similarity, rank, tag in zip(rows, scores.tolist(), semantic_similarity.tolist(), ranks.tolist(), tags.tolist()):
+        row.update({
+            "Score (%)": score,
+            "Semantic Similarity": similarity,
+            "AI Suggestion": generate_concise_ai_suggestion(
+                candidate_name=row["Candidate Name"],
+                score=score,
+                years_exp=row["Years Experience"],
+                semantic_similarity=similarity,
+                cgpa=row["CGPA (4.0 Scale)"]
+            ),
+            "Detailed HR Assessment": generate_detailed_hr_assessment(
+                candidate_name=row["Candidate Name"],
+                score=score,
+                years_exp=row["Years Experience"],
+                semantic_similarity=similarity,
+                cgpa=row["CGPA (4.0 Scale)"],
+                jd_text=None, # Not used by the assessment
+                resume_text=row["Resume Raw Text"],
+                matched_keywords=row["Matched Keywords"],
+                missing_skills=row["Missing Skills"],
+                max_exp_cutoff=max_experience
+            ),
+            "Certificate Rank": rank,
+            "Tag": tag,
+        })
+    return rows
+
 def resume_screener_page():
     st.title("🧠 ScreenerPro – AI-Powered Resume Screener")
 
@@ -1404,7 +1870,7 @@ def resume_screener_page():
             help="Select skills that are very important, but not as critical as high priority ones."
         )
 
-    resume_files = st.file_uploader("📄 **Upload Resumes (PDF, JPG, PNG)**", type=["pdf", "jpg", "jpeg", "png"], accept_multiple_files=True, help="Upload one or more PDF or image resumes for screening.")
+    resume_files = st.file_uploader("📄 **Upload Resumes (PDF, DOCX, TXT, RTF, JPG, PNG)**", type=["pdf", "docx", "txt", "rtf", "jpg", "jpeg", "png"], accept_multiple_files=True, help="Upload one or more PDF, Word, text or image resumes for screening.")
 
     if jd_text and resume_files:
         # Start overall timer
@@ -1440,42 +1906,33 @@ def resume_screener_page():
         # --- PHASE 1: Parallel Text Extraction ---
         start_time_extraction = time.time()
         st.info(f"Step 1/3: Extracting text from {total_resumes} resumes concurrently...")
-        extracted_texts_info = [] # Stores (file_name, text) tuples
-        file_infos_for_extraction = []
-        for file in resume_files:
-            file_data_bytes = file.read() # Read file content into memory once
-            file_infos_for_extraction.append((file_data_bytes, file.name, file.type))
-
-        # Define a chunk size for processing
-        CHUNK_SIZE = 10 # Process 10 resumes at a time to manage memory and CPU usage
-
-        # Use ProcessPoolExecutor for CPU-bound text extraction
-        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor: 
-            for i in range(0, total_resumes, CHUNK_SIZE):
-                chunk_files_info = file_infos_for_extraction[i:i + CHUNK_SIZE]
-                text_futures = [executor.submit(_extract_text_wrapper, info) for info in chunk_files_info]
-                
-                for j, future in enumerate(as_completed(text_futures)):
-                    current_processed = i + j + 1
-                    status_text.text(f"Extracting text: Processing resume {current_processed} of {total_resumes}...")
-                    try:
-                        extracted_texts_info.append(future.result())
-                    except Exception as e:
-                        st.error(f"Error extracting text for {chunk_files_info[j][1]}: {e}")
-                        extracted_texts_info.append((chunk_files_info[j][1], f"[ERROR] {e}")) # Mark as error
-                    progress_bar.progress(current_processed / total_resumes)
+        # Uploads are already in memory; getbuffer() views them without another copy, and
+        # only the ones missing from the extraction cache are copied into shared memory.
+        file_infos_for_extraction = [(file.getbuffer(), file.name, file.type) for file in resume_files]
+
+        def _update_extraction_progress(done, total):
+            status_text.text(f"Extracting text: Processing resume {done} of {total}...")
+            progress_bar.progress(done / total)
+
+        # Cached resumes are returned immediately; the rest go to the ProcessPoolExecutor
+        extracted_texts_info = extract_texts_concurrently(file_infos_for_extraction, on_progress=_update_extraction_progress) # Stores (file_name, text, report) tuples
+        del file_infos_for_extraction # Drop the buffer views so the uploads can be freed/closed
         
         end_time_extraction = time.time()
         print(f"Time taken for Text Extraction: {end_time_extraction - start_time_extraction:.2f} seconds")
+        page_source_counts = collections.Counter(source for _, _, report in extracted_texts_info for source in report["page_sources"])
+        print(f"Pages by extraction source: {dict(page_source_counts)}")
+        extraction_summary = summarize_extraction_telemetry(extracted_texts_info)
+        print(f"Extraction telemetry: {extraction_summary}")
 
         progress_bar.empty()
         status_text.empty()
 
         # Separate successfully extracted texts from failed ones
-        successfully_extracted_texts_map = {name: text for name, text in extracted_texts_info if not text.startswith("[ERROR]")}
+        successfully_extracted_texts_map = {name: text for name, text, _ in extracted_texts_info if not text.startswith("[ERROR]")}
         failed_extraction_results = [{
             "File Name": name,
-            "Candidate Name": name.replace('.pdf', '').replace('.jpg', '').replace('.jpeg', '').replace('.png', '').replace('_', ' ').title(),
+            "Candidate Name": candidate_name_from_file(name),
             "Score (%)": 0, "Years Experience": 0, "CGPA (4.0 Scale)": None,
             "Email": "Not Found", "Phone Number": "Not Found", "Location": "Not Found",
             "Languages": "Not Found", "Education Details": "Not Found",
@@ -1488,7 +1945,7 @@ def resume_screener_page():
             "JD Used": jd_name_for_results, "Date Screened": datetime.now().date(),
             "Certificate ID": str(uuid.uuid4()), "Certificate Rank": "Not Applicable",
             "Tag": "❌ Text Extraction Error"
-        } for name, text in extracted_texts_info if text.startswith("[ERROR]")]
+        } for name, text, _ in extracted_texts_info if text.startswith("[ERROR]")]
 
         if not successfully_extracted_texts_map:
             st.warning("No resumes had readable text extracted. Please check the files and try again.")
@@ -1499,24 +1956,25 @@ def resume_screener_page():
         start_time_embedding = time.time()
         st.info(f"Step 2/3: Generating embeddings for {len(successfully_extracted_texts_map)} resumes and JD...")
         jd_clean = clean_text(jd_text)
-        jd_embedding = global_sentence_model.encode([jd_clean])[0]
+        jd_profile = build_jd_profile(
+            jd_text, high_priority_skills, medium_priority_skills,
+            embedding=encode_texts([jd_clean])[0]
+        )
 
         resume_names_for_embedding = list(successfully_extracted_texts_map.keys())
         resume_texts_for_embedding = [successfully_extracted_texts_map[name] for name in resume_names_for_embedding]
         
-        # Use batch_size for encoding all resume texts
-        # Increased batch_size from 64 to 128 for better performance
-        resume_embeddings_array = global_sentence_model.encode(
-            resume_texts_for_embedding, 
-            batch_size=128, # Optimized batch size
-            show_progress_bar=False # Streamlit handles progress bar
-        )
+        # Resumes (or resume chunks) embedded in an earlier run, against any JD, come straight
+        # from the store; only new texts are encoded
+        resume_embeddings_array = embed_resumes(resume_texts_for_embedding, jd_profile.embedding)
         
         # Create a mapping from file_name to its embedding
         resume_embedding_map = {name: embed for name, embed in zip(resume_names_for_embedding, resume_embeddings_array)}
         
         end_time_embedding = time.time()
         print(f"Time taken for Embedding Generation: {end_time_embedding - start_time_embedding:.2f} seconds")
+        print(f"Embedding store: {sentence_embedding_store().stats()}")
+        print(f"Encode throughput by token budget (padded tokens/s): {get_encode_tuner().stats()}")
 
         progress_bar.empty()
         status_text.empty()
@@ -1525,35 +1983,44 @@ def resume_screener_page():
         start_time_analysis = time.time()
         st.info(f"Step 3/3: Processing {len(successfully_extracted_texts_map)} resumes with AI models concurrently...")
         
-        # Prepare arguments for the process pool
-        processing_args = []
-        for file_name in resume_names_for_embedding:
-            text = successfully_extracted_texts_map[file_name]
-            resume_embedding = resume_embedding_map[file_name]
-            processing_args.append((
-                file_name, text, jd_text, jd_embedding, resume_embedding,
-                jd_name_for_results, high_priority_skills, medium_priority_skills, max_experience,
-                global_ml_model
-            ))
+        # Prepare arguments for the process pool; the JD profile goes to each worker once
+        # through its initializer rather than with every resume. Workers only extract; the
+        # scoring model runs here, once for the whole batch.
+        cheap_fields = extract_cheap_fields_batch(resume_texts_for_embedding).to_dict("records")
+        processing_args = [
+            (file_name, successfully_extracted_texts_map[file_name], fields)
+            for file_name, fields in zip(resume_names_for_embedding, cheap_fields)
+        ]
         
         total_successful_resumes = len(processing_args)
         current_analysis_processed = 0
+        analyzed_rows = []
 
         # Use ProcessPoolExecutor for CPU-bound analysis
-        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor: 
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_analysis_worker,
+                                 initargs=(jd_profile, jd_name_for_results)) as executor:
             for i in range(0, total_successful_resumes, CHUNK_SIZE):
                 chunk_processing_args = processing_args[i:i + CHUNK_SIZE]
-                analysis_futures = [executor.submit(_process_single_resume_for_screener_page, *args) for args in chunk_processing_args]
+                analysis_futures = [executor.submit(_analyze_resume_in_worker, *args) for args in chunk_processing_args]
                 
                 for j, future in enumerate(as_completed(analysis_futures)):
                     current_analysis_processed = i + j + 1
                     status_text.text(f"Analyzing resumes: Processing candidate {current_analysis_processed} of {total_successful_resumes}...")
                     try:
                         result = future.result()
-                        results.append(result)
+                        # Error rows come back finished; the rest wait for batch scoring
+                        (analyzed_rows if "_keyword_overlap" in result else results).append(result)
                     except Exception as exc:
                         st.error(f"Resume processing generated an exception for {chunk_processing_args[j][0]}: {exc}")
                     progress_bar.progress(current_analysis_processed / total_successful_resumes)
+
+        start_time_scoring = time.time()
+        score_analyzed_resumes(
+            analyzed_rows, [resume_embedding_map[row["File Name"]] for row in analyzed_rows],
+            jd_profile.embedding, max_experience, global_ml_model
+        )
+        results.extend(analyzed_rows)
+        print(f"Time taken for Batch Scoring of {len(analyzed_rows)} resumes: {time.time() - start_time_scoring:.2f} seconds")
         
         # Add results from failed extractions back to the list
         results.extend(failed_extraction_results)
@@ -1579,6 +2046,18 @@ def resume_screener_page():
 
         # --- Conditional Display based on Role ---
         if st.session_state.get("user_role") in ["hr", "admin"]:
+            with st.expander("⏱️ Text Extraction Telemetry"):
+                col_p50, col_p95, col_ocr, col_conf = st.columns(4)
+                col_p50.metric("p50 per file", f"{extraction_summary['p50_ms']:.0f} ms" if extraction_summary['p50_ms'] is not None else "—")
+                col_p95.metric("p95 per file", f"{extraction_summary['p95_ms']:.0f} ms" if extraction_summary['p95_ms'] is not None else "—")
+                col_ocr.metric("Pages OCR'd", f"{extraction_summary['ocr_share']:.0%}", f"{extraction_summary['ocr_pages']} of {extraction_summary['pages']}", delta_color="off")
+                col_conf.metric("Mean OCR confidence", f"{extraction_summary['mean_ocr_confidence']:.0f}" if extraction_summary['mean_ocr_confidence'] is not None else "—")
+                st.caption(f"{extraction_summary['files']} files, {extraction_summary['cache_hits']} from the extraction cache, "
+                           f"{extraction_summary['errors']} failed. Time per step (ms): {extraction_summary['step_totals_ms']}")
+                if extraction_summary['slowest_files']:
+                    st.markdown("**Slowest files**")
+                    st.dataframe(pd.DataFrame(extraction_summary['slowest_files']), use_container_width=True, hide_index=True)
+
             st.markdown("---")
             st.markdown("## 📊 Candidate Score Comparison")
             st.caption("Visual overview of how each candidate ranks against the job requirements.")
@@ -1653,14 +2132,7 @@ def resume_screener_page():
                 if missing_skills_for_top:
                     missing_categorized = collections.defaultdict(list)
                     for skill in missing_skills_for_top:
-                        found_category = False
-                        for category, skills_in_category in SKILL_CATEGORIES.items():
-                            if skill.lower() in [s.lower() for s in skills_in_category]:
-                                missing_categorized[category].append(skill)
-                                found_category = True
-                                break
-                        if not found_category:
-                            missing_categorized["Uncategorized"].append(skill)
+                        missing_categorized[skill_category(skill)].append(SKILL_DISPLAY_NAMES.get(skill, skill))
                     
                     if missing_categorized:
                         for category, skills in missing_categorized.items():
@@ -4,6 +4,8 @@ import re
 import pandas as pd
 import io
 
+from resume_document import ResumeDocument
+
 # --- Styling ---
 st.markdown("""
 <style>
@@ -52,13 +54,23 @@ resume_texts = {}
 
 if resumes:
     st.success(f"✅ {len(resumes)} resume(s) uploaded.")
+    # Parsed documents are kept across reruns (each keystroke in the search box is one),
+    # so a PDF is only read once per upload; None marks a file that could not be read.
+    parsed_documents = st.session_state.setdefault('resume_search_documents', {})
+    for file_id in set(parsed_documents) - {resume.file_id for resume in resumes}:
+        del parsed_documents[file_id]
     for resume in resumes:
-        try:
-            with pdfplumber.open(resume) as pdf:
-                text = ''.join(page.extract_text() or '' for page in pdf.pages)
-                resume_texts[resume.name] = text
-        except Exception as e:
+        if resume.file_id not in parsed_documents:
+            try:
+                with pdfplumber.open(resume) as pdf:
+                    text = ''.join(page.extract_text() or '' for page in pdf.pages)
+                    parsed_documents[resume.file_id] = ResumeDocument(text)
+            except Exception as e:
+                parsed_documents[resume.file_id] = None
+        if parsed_documents[resume.file_id] is None:
             st.warning(f"⚠️ Error reading {resume.name}")
+        else:
+            resume_texts[resume.name] = parsed_documents[resume.file_id]
 
     query = st.text_input("🔎 Enter keywords (comma-separated)").strip().lower()
     download_rows = []
@@ -68,8 +80,9 @@ if resumes:
         st.markdown("### 📄 Search Results")
         found = False
 
-        for name, content in resume_texts.items():
-            content_lower = content.lower()
+        for name, document in resume_texts.items():
+            content = document.text
+            content_lower = document.lower
             matched_snippets = []
             for keyword in keywords:
                 if keyword in content_lower:
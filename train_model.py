@@ -3,7 +3,7 @@ import numpy as np
 import pandas as pd
 import re
 from datetime import datetime
-from sentence_transformers import SentenceTransformer
+from embedding_backends import EMBEDDING_BACKEND, create_embedding_backend
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.metrics import mean_squared_error, r2_score
@@ -217,10 +217,10 @@ def create_features(jd_text, resume_text, jd_model, resume_model):
 if __name__ == "__main__":
     print("Starting model training process...")
 
-    # Load pre-trained SentenceTransformer models
+    # Load the pre-trained SentenceTransformer model once, on the same backend as the screener
+    # (SCREENER_EMBEDDING_BACKEND), so training features match the ones scored at runtime.
     # Using 'all-MiniLM-L6-v2' for efficiency and good performance (384 dimensions per embedding)
-    jd_embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-    resume_embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    jd_embedding_model = resume_embedding_model = create_embedding_backend(EMBEDDING_BACKEND, 'all-MiniLM-L6-v2')
     print("SentenceTransformer model loaded.")
 
     # --- Synthetic Data (Leave this empty for you to paste your data) ---
@@ -0,0 +1,267 @@
+import collections
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import wait as wait_for_connections
+
+# --- Supervised process pool for untrusted documents ---
+# ProcessPoolExecutor cannot stop a task once it is running: one malformed PDF that sends
+# pdfplumber or poppler into an endless loop (or balloons its memory) stalls the whole run.
+# SupervisedPool runs each worker on its own pipe so the parent always knows which task a
+# worker holds. A worker that goes over its task deadline or memory ceiling is killed and
+# replaced, and only that task's future fails. Workers are also retired after a fixed number
+# of tasks, so leaks in native libraries cannot build up over a long bulk run.
+# submit() returns concurrent.futures.Future objects, so callers can keep using wait().
+
+POLL_INTERVAL_S = 0.05
+# Workers that die in a row before reporting ready (e.g. a raising initializer) after which
+# the pool is marked broken instead of forking replacements forever
+MAX_STARTUP_FAILURES = 3
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+class WorkerMemoryExceeded(Exception):
+    pass
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+class PoolBroken(Exception):
+    """Workers cannot be started or the supervisor thread failed; no further tasks will run."""
+    pass
+
+
+def _read_rss_bytes(pid):
+    """Resident set size of a process from /proc, or None where /proc is not available."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _worker_main(conn, initializer, initargs):
+    if initializer is not None:
+        initializer(*initargs)
+    conn.send(("ready", None))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        fn, args = task
+        try:
+            message = ("ok", fn(*args))
+        except Exception as e:
+            message = ("error", e)
+        try:
+            conn.send(message)
+        except Exception as e: # Result or exception could not be pickled
+            conn.send(("error", RuntimeError(f"Could not return result from worker: {e}")))
+
+
+class _Worker:
+    def __init__(self, context, initializer, initargs):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, initargs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.tasks_done = 0
+        self.task = None # (future, fn, args, timeout)
+        self.deadline = None
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def retire(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+
+class SupervisedPool:
+    def __init__(self, max_workers=None, initializer=None, initargs=(), task_timeout=None,
+                 max_rss_bytes=None, max_tasks_per_worker=None):
+        """
+        task_timeout:         seconds a task may run in a worker before the worker is killed.
+        max_rss_bytes:        resident memory a worker may reach before it is killed.
+        max_tasks_per_worker: tasks after which a worker is replaced by a fresh process.
+        Any of them can be None (or 0) to disable that limit.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.initializer = initializer
+        self.initargs = initargs
+        self.task_timeout = task_timeout or None
+        self.max_rss_bytes = max_rss_bytes or None
+        self.max_tasks_per_worker = max_tasks_per_worker or None
+        self.stats = collections.Counter()
+
+        # Workers inherit the parent's loaded modules instead of re-importing them
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        self._context = multiprocessing.get_context(method)
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._shutdown = False
+        self._broken = None # PoolBroken once the supervisor has failed
+        self._startup_failures = 0 # Consecutive workers that died before reporting ready
+        self._supervisor = threading.Thread(target=self._supervise, name="SupervisedPool", daemon=True)
+        self._supervisor.start()
+
+    def submit(self, fn, *args, timeout=None):
+        """Queues fn(*args) for a worker. `timeout` overrides the pool's task_timeout."""
+        future = Future()
+        with self._lock:
+            if self._broken is not None:
+                raise PoolBroken(str(self._broken))
+            if self._shutdown:
+                raise RuntimeError("cannot submit to a pool that has been shut down")
+            self._queue.append((future, fn, args, timeout or self.task_timeout))
+        return future
+
+    def shutdown(self, cancel_pending=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_pending:
+                while self._queue:
+                    self._queue.popleft()[0].cancel()
+        self._supervisor.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.shutdown(cancel_pending=exc_type is not None)
+
+    # --- Supervisor thread ---
+    def _supervise(self):
+        try:
+            while True:
+                with self._lock:
+                    finished = self._shutdown and not self._queue and all(w.task is None for w in self._workers)
+                if finished:
+                    break
+                self._start_workers()
+                self._dispatch()
+                busy_conns = {w.conn: w for w in self._workers}
+                for conn in wait_for_connections(list(busy_conns), timeout=POLL_INTERVAL_S):
+                    self._receive(busy_conns[conn])
+                self._enforce_limits()
+        except Exception as e:
+            # E.g. a failed fork or workers that cannot start: fail every queued and running
+            # task instead of leaving callers waiting on futures that would never resolve
+            if isinstance(e, PoolBroken):
+                error = e
+            else:
+                error = PoolBroken(f"Worker pool supervisor failed: {e!r}")
+                error.__cause__ = e
+            with self._lock:
+                self._broken = error
+                queued = [task[0] for task in self._queue]
+                self._queue.clear()
+            for future in queued + [w.task[0] for w in self._workers if w.task is not None]:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            for worker in self._workers:
+                worker.retire()
+            self._workers = []
+
+    def _start_workers(self):
+        with self._lock:
+            wanted = min(self.max_workers, len(self._queue) + sum(1 for w in self._workers if w.task is not None))
+        while len(self._workers) < wanted:
+            self._workers.append(_Worker(self._context, self.initializer, self.initargs))
+            self.stats["workers_started"] += 1
+
+    def _dispatch(self):
+        for worker in self._workers:
+            if not worker.ready or worker.task is not None:
+                continue
+            with self._lock:
+                if not self._queue:
+                    return
+                task = self._queue.popleft()
+            future, fn, args, timeout = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            worker.task = task
+            worker.deadline = time.monotonic() + timeout if timeout else None
+            try:
+                worker.conn.send((fn, args))
+            except Exception as e:
+                worker.task = None
+                future.set_exception(e)
+
+    def _receive(self, worker):
+        try:
+            status, value = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(timeout=1)
+            exitcode = worker.process.exitcode
+            self._replace(worker, WorkerCrashed(f"Worker process exited unexpectedly (exit code {exitcode})"))
+            if not worker.ready:
+                self._startup_failures += 1
+                if self._startup_failures >= MAX_STARTUP_FAILURES:
+                    raise PoolBroken(f"{self._startup_failures} worker processes in a row exited before "
+                                     f"becoming ready (last exit code {exitcode}); is the initializer failing?")
+            return
+        if status == "ready":
+            worker.ready = True
+            self._startup_failures = 0
+            return
+        future = worker.task[0]
+        worker.task = None
+        worker.deadline = None
+        worker.tasks_done += 1
+        if status == "ok":
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+        if self.max_tasks_per_worker and worker.tasks_done >= self.max_tasks_per_worker:
+            self.stats["workers_recycled"] += 1
+            self._workers.remove(worker)
+            worker.retire()
+
+    def _enforce_limits(self):
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.task is None:
+                continue
+            if worker.deadline is not None and now > worker.deadline:
+                self.stats["tasks_timed_out"] += 1
+                self._replace(worker, TaskTimeout(f"Timed out after {worker.task[3]:g}s"))
+                continue
+            if self.max_rss_bytes:
+                rss = _read_rss_bytes(worker.process.pid)
+                if rss is not None and rss > self.max_rss_bytes:
+                    self.stats["workers_over_memory"] += 1
+                    self._replace(worker, WorkerMemoryExceeded(
+                        f"Worker exceeded memory limit ({rss // (1024 * 1024)} MB > {self.max_rss_bytes // (1024 * 1024)} MB)"))
+
+    def _replace(self, worker, error):
+        """Kills a worker; its task (if any) fails with `error`. _start_workers() starts a replacement."""
+        self._workers.remove(worker)
+        worker.kill()
+        self.stats["workers_killed"] += 1
+        if worker.task is not None:
+            worker.task[0].set_exception(error)